@@ -0,0 +1,226 @@
+"""
+Background live analysis for the overlay.
+
+An AnalysisWorker runs a separate process (so the search never competes
+with the render loop for the GIL) that scores every legal move of a
+position with iterative-deepening alpha-beta (negamax over the rules.py
+states, using play / undo). After every finished depth the move scores
+are sent back through a pipe; the render loop picks them up with poll(),
+which only returns something when the values changed. Starting a new
+position or calling cancel() bumps a shared generation counter, and the
+running search gives up within a few hundred nodes.
+"""
+import multiprocessing
+import os
+
+from .line_index import LineCounters
+from .rules import OthelloState, DRAW, other
+
+WIN = 10000 # Score of a won k-in-a-row position (minus the plies needed)
+
+
+class _Cancelled(Exception):
+    pass
+
+
+# --- Evaluation (score for the side to move) ---
+
+def window_evaluation(state):
+    """
+    k-in-a-row heuristic on the state's LineCounters: open lines count
+    4^stones for their owner. Without gravity every threat cell is
+    playable, so an own threat wins now, and the opponent threatening to
+    win on two different cells cannot be stopped.
+    """
+    if state.winner is not None:
+        # The side to move can only have lost (or drawn)
+        return 0 if state.winner == DRAW else -WIN
+    lines, me = state.lines, state.to_move
+    opponent = other(me)
+    if not state.GRAVITY:
+        if lines.threats[me]:
+            return WIN // 2
+        # Counted by cell: two threat lines through one empty cell are blocked by one move
+        if lines.threats[opponent] >= 2 and len(lines.winning_cells(opponent, state.cells)) >= 2:
+            return -WIN // 2
+    score = 0
+    for mine, theirs in zip(lines.counts[me], lines.counts[opponent]):
+        if mine and not theirs:
+            score += 4 ** mine
+        elif theirs and not mine:
+            score -= 4 ** theirs
+    return score
+
+
+_PATTERN_EVALUATOR = None
+
+
+def default_evaluator(state):
+    """ Pattern tables for Othello (untrained positional ones unless fitted locally), line windows otherwise """
+    global _PATTERN_EVALUATOR
+    if isinstance(state, OthelloState):
+        if _PATTERN_EVALUATOR is None:
+            from .othello_patterns import PatternEvaluator
+            _PATTERN_EVALUATOR = PatternEvaluator.default()
+        return _PATTERN_EVALUATOR.evaluate
+    return window_evaluation
+
+
+class AnalysisWorker:
+    """ Handle of one analysis process; always analyses the most recently requested position """
+
+    def __init__(self, max_depth=12):
+        self.MAX_DEPTH = max_depth
+        # Spawn instead of fork: the parent has SDL (and its threads) initialised
+        context = multiprocessing.get_context("spawn")
+        self._connection, child_connection = context.Pipe()
+        self._generation = 0 # Bumped by analyze() / cancel()
+        self._shared_generation = context.RawValue("i", 0) # Read by the running search
+        self._result = None  # (depth, {move: score}) of the current generation
+        self._new_result = False
+        self.alive = True    # False once the process is gone (crashed, killed, failed to start)
+        self._process = context.Process(target=_analysis_process, name="analysis", daemon=True,
+                                        args=(child_connection, self._shared_generation, max_depth))
+        self._process.start()
+        child_connection.close()
+
+    def analyze(self, state):
+        """ Starts analysing `state` (a rules state), dropping any previous job """
+        self.cancel()
+        if not self.alive:
+            return
+        try:
+            self._connection.send((self._generation, state))
+        except OSError:
+            self.alive = False
+
+    def cancel(self):
+        self._generation += 1
+        self._shared_generation.value = self._generation
+        self._result = None
+        self._new_result = False
+
+    def poll(self):
+        """ (depth, {move: score}) if the scores changed since the last poll, else None """
+        if not self.alive:
+            return None
+        try:
+            while self._connection.poll():
+                generation, depth, scores = self._connection.recv()
+                # A deeper search that confirms the same scores is not pushed to the render loop
+                if generation == self._generation and (self._result is None or scores != self._result[1]):
+                    self._result = (depth, scores)
+                    self._new_result = True
+        except (EOFError, OSError):
+            self.alive = False
+            return None
+        if not self._new_result:
+            return None
+        self._new_result = False
+        return self._result
+
+    def stop(self):
+        self.cancel()
+        if self.alive:
+            try:
+                self._connection.send(None)
+            except OSError:
+                pass # Process already gone
+            self.alive = False
+        self._process.join(timeout=1.0)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._connection.close()
+
+
+def _analysis_process(connection, shared_generation, max_depth):
+    """ Entry point of the analysis process: serves jobs until it gets None """
+    if hasattr(os, "nice"):
+        os.nice(10) # Leave the CPU to the game first
+    search = _Search(shared_generation, max_depth)
+    while True:
+        try:
+            job = connection.recv()
+            while job is not None and connection.poll(): # Only the newest position matters
+                job = connection.recv()
+        except (EOFError, OSError):
+            return # Game closed the pipe
+        if job is None:
+            return
+        generation, state = job
+        try:
+            for depth, scores in search.iterative_deepening(state, generation):
+                connection.send((generation, depth, scores))
+        except _Cancelled:
+            pass
+
+
+class _Search:
+    """ Iterative-deepening alpha-beta that aborts once the shared generation moves on """
+
+    def __init__(self, shared_generation, max_depth):
+        self.shared_generation = shared_generation
+        self.MAX_DEPTH = max_depth
+        self.nodes = 0
+
+    def iterative_deepening(self, state, generation):
+        """ Yields (depth, {move: score}) after every finished depth """
+        if not isinstance(state, OthelloState) and state.lines is None:
+            state.lines = LineCounters.from_cells(state.ROWS, state.COLS, state.K, state.cells)
+        evaluate = default_evaluator(state)
+        moves = state.legal_moves()
+        # A k-in-a-row search is complete once it reaches the last free cell
+        limit = min(self.MAX_DEPTH, getattr(state, "empty_count", self.MAX_DEPTH))
+        for depth in range(1, limit + 1):
+            # Every root move gets a full window: the overlay shows exact scores, not bounds
+            scores = {move: self._score_move(state, move, depth, evaluate, generation) for move in moves}
+            yield depth, scores
+
+    def _score_move(self, state, move, depth, evaluate, generation):
+        """ Score of `move` for the side to move in `state` """
+        mover = state.to_move
+        state.play(move)
+        try:
+            value = self._negamax(state, depth - 1, -float("inf"), float("inf"), evaluate, generation, 1)
+            return -value if state.to_move != mover else value
+        finally:
+            state.undo()
+
+    def _negamax(self, state, depth, alpha, beta, evaluate, generation, ply):
+        """ Alpha-beta value for the side to move; Othello passes keep the same side """
+        self.nodes += 1
+        if self.nodes & 255 == 0 and generation != self.shared_generation.value:
+            raise _Cancelled()
+
+        if state.winner is not None or depth == 0:
+            value = evaluate(state)
+            # Prefer faster wins and slower losses
+            if value <= -WIN:
+                value += ply
+            return value
+
+        best = -float("inf")
+        for move in state.legal_moves():
+            mover = state.to_move
+            state.play(move)
+            if state.to_move != mover:
+                value = -self._negamax(state, depth - 1, -beta, -alpha, evaluate, generation, ply + 1)
+            else:
+                value = self._negamax(state, depth - 1, alpha, beta, evaluate, generation, ply + 1)
+            state.undo()
+            if value > best:
+                best = value
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+        return best
+
+
+def format_score(score):
+    """ Short overlay label for a move score """
+    if score >= WIN - 100:
+        return "Win"
+    if score <= -WIN + 100:
+        return "Loss"
+    return f"{score:+.0f}"
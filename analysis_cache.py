@@ -0,0 +1,246 @@
+"""
+Persistent analysis cache shared by all games and across restarts.
+
+Positions are reduced to a canonical form under the board's symmetries
+(8 rotations / mirrors for square boards, the left-right mirror for
+Connect Four) so every symmetric variant shares one entry. Entries hold
+the best move (stored in canonical coordinates and mapped back on lookup),
+a score and the search depth that produced it.
+
+Two tiers: a bounded in-memory LRU in front of a size-bounded SQLite file.
+Writes go to memory immediately and are flushed to disk in batches.
+"""
+import atexit
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+
+from .rules import OthelloState
+
+DEFAULT_PATH = "analysis_cache.sqlite"
+
+
+def _symmetries(rows, cols, gravity):
+    """ Square permutations (perm[index] = new index) that map the board onto itself """
+    transforms = [lambda r, c: (r, c), lambda r, c: (r, cols - 1 - c)]
+    if not gravity:
+        transforms += [lambda r, c: (rows - 1 - r, c), lambda r, c: (rows - 1 - r, cols - 1 - c)]
+        if rows == cols:
+            n = rows - 1
+            transforms += [lambda r, c: (c, r), lambda r, c: (c, n - r),
+                           lambda r, c: (n - c, r), lambda r, c: (n - c, n - r)]
+    perms = []
+    for transform in transforms:
+        perm = []
+        for index in range(rows * cols):
+            r, c = transform(index // cols, index % cols)
+            perm.append(r * cols + c)
+        perms.append(perm)
+    return perms
+
+
+class BoardSymmetry:
+    """ Canonicalizes positions of one board geometry with per-byte lookup tables """
+
+    def __init__(self, rows, cols, gravity):
+        self.ROWS, self.COLS, self.GRAVITY = rows, cols, gravity
+        self.perms = _symmetries(rows, cols, gravity)
+        self.inverse = [[0] * len(perm) for perm in self.perms]
+        for perm, inverse in zip(self.perms, self.inverse):
+            for index, target in enumerate(perm):
+                inverse[target] = index
+
+        # byte_tables[s][k][b]: bitboard bits for byte value b at byte position k under symmetry s
+        cells = rows * cols
+        self.nbytes = (cells + 7) // 8
+        self.byte_tables = []
+        for perm in self.perms:
+            tables = []
+            for k in range(self.nbytes):
+                table = [0] * 256
+                for b in range(256):
+                    bits = 0
+                    for i in range(8):
+                        if b >> i & 1 and 8 * k + i < cells:
+                            bits |= 1 << perm[8 * k + i]
+                    table[b] = bits
+                tables.append(table)
+            self.byte_tables.append(tables)
+
+    def transform(self, symmetry, bitboard):
+        result = 0
+        for table in self.byte_tables[symmetry]:
+            result |= table[bitboard & 255]
+            bitboard >>= 8
+        return result
+
+    def canonical(self, first, second, to_move):
+        """ Returns (key bytes, symmetry index) of the smallest symmetric variant """
+        best, best_symmetry = None, 0
+        for symmetry in range(len(self.perms)):
+            variant = (self.transform(symmetry, first), self.transform(symmetry, second))
+            if best is None or variant < best:
+                best, best_symmetry = variant, symmetry
+        key = bytes((to_move,)) + best[0].to_bytes(self.nbytes, "little") + best[1].to_bytes(self.nbytes, "little")
+        return key, best_symmetry
+
+    def move_to_canonical(self, symmetry, move):
+        if self.GRAVITY: # Column moves: the only symmetry is the mirror
+            return self.COLS - 1 - move if symmetry else move
+        return self.perms[symmetry][move]
+
+    def move_from_canonical(self, symmetry, move):
+        if self.GRAVITY:
+            return self.COLS - 1 - move if symmetry else move
+        return self.inverse[symmetry][move]
+
+
+def position_of(state):
+    """ (game name, first bitboard, second bitboard, symmetry) for a rules state """
+    if isinstance(state, OthelloState):
+        return "othello", state.black, state.white, _symmetry_for(8, 8, False)
+    first = second = 0
+    for index, player in enumerate(state.cells):
+        if player == 1:
+            first |= 1 << index
+        elif player == 2:
+            second |= 1 << index
+    name = f"{'drop' if state.GRAVITY else 'grid'}{state.ROWS}x{state.COLS}k{state.K}"
+    return name, first, second, _symmetry_for(state.ROWS, state.COLS, state.GRAVITY)
+
+
+_SYMMETRY_CACHE = {}
+
+
+def _symmetry_for(rows, cols, gravity):
+    key = (rows, cols, gravity)
+    if key not in _SYMMETRY_CACHE:
+        _SYMMETRY_CACHE[key] = BoardSymmetry(rows, cols, gravity)
+    return _SYMMETRY_CACHE[key]
+
+
+class AnalysisCache:
+    """
+    Position -> (best move, score, depth). Use path=None for a memory-only
+    cache. `max_entries` bounds the disk file (oldest-used rows are evicted),
+    `memory_entries` bounds the in-memory LRU.
+    """
+
+    _shared = None
+
+    def __init__(self, path=DEFAULT_PATH, max_entries=500000, memory_entries=50000, flush_every=256):
+        self.MAX_ENTRIES = max_entries
+        self.MEMORY_ENTRIES = memory_entries
+        self.FLUSH_EVERY = flush_every
+        self.memory = OrderedDict()  # (game, key) -> (move, score, depth)
+        self.dirty = {}              # Entries not yet written to disk
+        self.hits = 0
+        self.misses = 0
+
+        self.db = None
+        if path is not None:
+            self.db = sqlite3.connect(path)
+            self.db.execute("""CREATE TABLE IF NOT EXISTS analysis (
+                game TEXT NOT NULL, key BLOB NOT NULL,
+                move INTEGER, score REAL, depth INTEGER, last_used REAL,
+                PRIMARY KEY (game, key))""")
+            self.db.execute("CREATE INDEX IF NOT EXISTS analysis_last_used ON analysis (last_used)")
+            self.db.commit()
+
+    @classmethod
+    def shared(cls):
+        """ One process-wide cache in the working directory, flushed at exit """
+        if cls._shared is None:
+            cls._shared = cls(os.environ.get("GAMES_ANALYSIS_CACHE", DEFAULT_PATH))
+            atexit.register(cls._shared.close)
+        return cls._shared
+
+    # --- Lookup / store ---
+
+    def lookup(self, state, min_depth=0, namespace=""):
+        """
+        Returns (move, score, depth) for `state` if known with at least
+        `min_depth`, else None. Searches whose depths are not comparable
+        (MCTS visits, alpha-beta plies) use different namespaces.
+        """
+        game, first, second, symmetry = position_of(state)
+        game = namespace + game
+        key, s = symmetry.canonical(first, second, state.to_move)
+        entry = self._get((game, key))
+        if entry is None or entry[2] < min_depth:
+            self.misses += 1
+            return None
+        self.hits += 1
+        move, score, depth = entry
+        return symmetry.move_from_canonical(s, move), score, depth
+
+    def store(self, state, move, score, depth, namespace=""):
+        """ Remembers a search result; deeper results replace shallower ones """
+        game, first, second, symmetry = position_of(state)
+        game = namespace + game
+        key, s = symmetry.canonical(first, second, state.to_move)
+        existing = self._get((game, key))
+        if existing is not None and existing[2] > depth:
+            return
+        entry = (symmetry.move_to_canonical(s, move), score, depth)
+        self._remember((game, key), entry)
+        if self.db is not None:
+            self.dirty[(game, key)] = entry
+            if len(self.dirty) >= self.FLUSH_EVERY:
+                self.flush()
+
+    def _get(self, cache_key):
+        entry = self.memory.get(cache_key)
+        if entry is not None:
+            self.memory.move_to_end(cache_key)
+            return entry
+        if self.db is None:
+            return None
+        row = self.db.execute("SELECT move, score, depth FROM analysis WHERE game = ? AND key = ?",
+                              cache_key).fetchone()
+        if row is None:
+            return None
+        entry = tuple(row)
+        self._remember(cache_key, entry)
+        self.dirty[cache_key] = entry # Refreshes last_used on the next flush
+        return entry
+
+    def _remember(self, cache_key, entry):
+        self.memory[cache_key] = entry
+        self.memory.move_to_end(cache_key)
+        while len(self.memory) > self.MEMORY_ENTRIES:
+            self.memory.popitem(last=False)
+
+    # --- Disk ---
+
+    def flush(self):
+        """ Writes pending entries and evicts the least recently used rows above MAX_ENTRIES """
+        if self.db is None or not self.dirty:
+            return
+        now = time.time()
+        self.db.executemany(
+            "INSERT OR REPLACE INTO analysis (game, key, move, score, depth, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+            [(game, key, move, score, depth, now) for (game, key), (move, score, depth) in self.dirty.items()])
+        self.dirty.clear()
+
+        count = self.db.execute("SELECT COUNT(*) FROM analysis").fetchone()[0]
+        if count > self.MAX_ENTRIES:
+            # Evict down to 90% so eviction does not run on every flush
+            excess = count - self.MAX_ENTRIES * 9 // 10
+            self.db.execute("DELETE FROM analysis WHERE rowid IN "
+                            "(SELECT rowid FROM analysis ORDER BY last_used LIMIT ?)", (excess,))
+        self.db.commit()
+
+    def close(self):
+        if self.db is not None:
+            self.flush()
+            self.db.close()
+            self.db = None
+
+    def stats(self):
+        return {
+            "cache_memory_entries": len(self.memory),
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+        }
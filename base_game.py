@@ -1,6 +1,23 @@
+import os
 import pygame
+from collections import namedtuple
+from . import snapshot
+from .analysis import AnalysisWorker, format_score
+from .line_index import LineCounters
+from .rules import PLAYER_1, PLAYER_2, DRAW
+
+# SDL would turn SIGTERM / SIGINT into pygame.QUIT, which deletes the snapshot like a
+# deliberate exit. A kiosk shutdown or reboot must keep it, so leave signals to Python.
+os.environ.setdefault("SDL_NO_SIGNAL_HANDLERS", "1")
+
+# One entry of the move stack: just enough to put the board and turn state back
+MoveRecord = namedtuple("MoveRecord", ["row", "col", "player", "flips", "flipped_from",
+                                       "game_over", "winner", "status"])
 
 class BaseGridGame:
+    EMPTY = None   # Value of a free cell on BOARD
+    GAME_ID = None # Name used in snapshots (see snapshot.GAME_IDS)
+
     def __init__(self, rows, cols, cell_size=150, header_size=50):
         # --- Core Grid Parameters ---
         self.ROWS = rows
@@ -33,6 +50,23 @@ class BaseGridGame:
 
         self.clock = pygame.time.Clock()
 
+        # --- Move stack (make / unmake, takeback) ---
+        self.MOVE_STACK = []
+        self.LINES = None # line_index.LineCounters for k-in-a-row games, kept in sync by make / unmake
+
+        # --- Snapshots (resume after a restart) ---
+        self.PIECES = {}           # Board piece -> rules player (PLAYER_1 / PLAYER_2), set by the child
+        self.SNAPSHOT_PATH = None  # If set, the game is snapshotted there after every move
+
+        # --- Live analysis overlay ('A' toggles it) ---
+        self.ANALYSIS = None         # AnalysisWorker while the overlay is on
+        self.ANALYSIS_LABELS = {}    # (row, col) -> rendered score label of a legal move
+        self.POSITION_VERSION = 0    # Bumped on every make / unmake, so the overlay knows when to restart
+        self._analysis_version = None
+        self._analysis_cells = {}    # Rules move -> (row, col) of the analysed position
+        self.FONT_ANALYSIS = pygame.font.Font(None, 28)
+        self.COLOR_ANALYSIS_TEXT = (255, 230, 0)
+
     def draw_grid_and_headers(self):
         # Full background
         self.SCREEN.fill(self.COLOR_BG)
@@ -100,6 +134,162 @@ class BaseGridGame:
         text_rect = text.get_rect(center=(self.WIDTH // 2, self.HEIGHT - self.STATUS_HEIGHT // 2))
         self.SCREEN.blit(text, text_rect)
 
+    # --- Make / unmake moves ---
+
+    def make_move(self, row, col, piece, flips=()):
+        """
+        Places `piece` at (row, col), turns the cells in `flips` to `piece`
+        and pushes a MoveRecord so the move can be taken back later.
+        """
+        flipped_from = self.BOARD[flips[0][0]][flips[0][1]] if flips else None
+        self.MOVE_STACK.append(MoveRecord(row, col, self.CURRENT_PLAYER, tuple(flips), flipped_from,
+                                          self.GAME_OVER, self.WINNER, getattr(self, "STATUS_MESSAGE", None)))
+        self.BOARD[row][col] = piece
+        for r, c in flips:
+            self.BOARD[r][c] = piece
+        if self.LINES is not None:
+            self.LINES.place(row * self.COLS + col, self.PIECES[piece])
+        self._position_changed()
+
+    def unmake_move(self):
+        """ Undoes the last make_move in O(flips) and returns its MoveRecord """
+        record = self.MOVE_STACK.pop()
+        if self.LINES is not None:
+            self.LINES.unplace(record.row * self.COLS + record.col, self.PIECES[self.BOARD[record.row][record.col]])
+        self.BOARD[record.row][record.col] = self.EMPTY
+        for r, c in record.flips:
+            self.BOARD[r][c] = record.flipped_from
+        self.CURRENT_PLAYER = record.player
+        self.GAME_OVER = record.game_over
+        self.WINNER = record.winner
+        if record.status is not None:
+            self.STATUS_MESSAGE = record.status
+        self._position_changed()
+        return record
+
+    def takeback(self):
+        """ Undoes moves until the last move of the human player is taken back """
+        while self.MOVE_STACK:
+            record = self.unmake_move()
+            if record.player == self.HUMAN_PLAYER:
+                print(f"[PLAYER] Takeback of {self._coord_to_algebraic(record.row, record.col)}")
+                break
+
+    # --- Snapshot / restore ---
+
+    def snapshot(self):
+        """ Packs BOARD, current player and result into a GameSnapshot """
+        first = second = 0
+        for r in range(self.ROWS):
+            for c in range(self.COLS):
+                player = self.PIECES.get(self.BOARD[r][c])
+                if player == PLAYER_1:
+                    first |= 1 << (r * self.COLS + c)
+                elif player == PLAYER_2:
+                    second |= 1 << (r * self.COLS + c)
+
+        if self.WINNER in self.PIECES:
+            winner = self.PIECES[self.WINNER]
+        else:
+            winner = DRAW if self.GAME_OVER else None
+        return snapshot.GameSnapshot(self.GAME_ID, self.ROWS, self.COLS, self.PIECES[self.CURRENT_PLAYER],
+                                     winner, self.GAME_OVER, first, second)
+
+    def restore(self, saved):
+        """ Puts the game into the state of a GameSnapshot (the move stack starts empty) """
+        if saved.game != self.GAME_ID or (saved.rows, saved.cols) != (self.ROWS, self.COLS):
+            raise ValueError(f"Snapshot of '{saved.game}' does not fit {type(self).__name__}")
+
+        pieces = {player: piece for piece, player in self.PIECES.items()}
+        for r in range(self.ROWS):
+            for c in range(self.COLS):
+                self.BOARD[r][c] = self.EMPTY
+        for r, c, player in saved.cells():
+            self.BOARD[r][c] = pieces[player]
+        if self.LINES is not None:
+            self.LINES = LineCounters.from_cells(self.ROWS, self.COLS, self.LINES.index.K,
+                                                 [self.PIECES.get(piece, 0) for row in self.BOARD for piece in row])
+
+        self.MOVE_STACK.clear()
+        self.CURRENT_PLAYER = pieces[saved.to_move]
+        self.GAME_OVER = saved.game_over
+        self.WINNER = pieces.get(saved.winner)
+        self._position_changed()
+        self.after_restore()
+
+    def after_restore(self):
+        """ Hook to rebuild derived state (status message, valid moves) after restore() """
+        pass
+
+    def save_snapshot(self):
+        """ Snapshots a running game to SNAPSHOT_PATH; a finished game leaves nothing to resume """
+        if self.SNAPSHOT_PATH is None:
+            return
+        if self.GAME_OVER:
+            snapshot.remove(self.SNAPSHOT_PATH)
+        else:
+            snapshot.save(self.SNAPSHOT_PATH, self.snapshot())
+
+    # --- Live analysis overlay ---
+
+    def rules_state(self):
+        """ Headless rules state of the current position (see rules.py), or None if the game has none """
+        return None
+
+    def _position_changed(self):
+        """ Cancels a running analysis immediately; the old scores no longer apply """
+        self.POSITION_VERSION += 1
+        self.ANALYSIS_LABELS = {}
+        if self.ANALYSIS is not None:
+            self.ANALYSIS.cancel()
+
+    def toggle_analysis(self):
+        """ Switches the background analysis overlay on or off """
+        if self.ANALYSIS is not None:
+            self.ANALYSIS.stop()
+            self.ANALYSIS = None
+            self.ANALYSIS_LABELS = {}
+        elif self.rules_state() is not None:
+            self.ANALYSIS = AnalysisWorker()
+            self._analysis_version = None
+        else:
+            print(f"No analysis available for {type(self).__name__}")
+
+    def update_analysis(self):
+        """
+        Called once per frame: starts analysing a new position on the human's
+        turn and re-renders the labels only when the worker published new scores.
+        """
+        if self.ANALYSIS is None:
+            return
+        if self._analysis_version != self.POSITION_VERSION:
+            self._analysis_version = self.POSITION_VERSION
+            if self.GAME_OVER or self.CURRENT_PLAYER != self.HUMAN_PLAYER:
+                return
+            state = self.rules_state()
+            self._analysis_cells = {move: state.move_to_coord(move) for move in state.legal_moves()}
+            self.ANALYSIS.analyze(state)
+
+        result = self.ANALYSIS.poll()
+        if not self.ANALYSIS.alive:
+            print("Analysis process stopped, overlay switched off")
+            self.toggle_analysis()
+            return
+        if result is not None:
+            depth, scores = result
+            self.ANALYSIS_LABELS = {
+                self._analysis_cells[move]: self.FONT_ANALYSIS.render(format_score(score), True,
+                                                                      self.COLOR_ANALYSIS_TEXT)
+                for move, score in scores.items()
+            }
+
+    def draw_analysis_overlay(self):
+        """ Blits the cached score labels onto their cells """
+        for (r, c), label in self.ANALYSIS_LABELS.items():
+            x_center = self.HEADER_SIZE + c * self.CELL_SIZE + self.CELL_SIZE // 2
+            y_center = self.HEADER_SIZE + r * self.CELL_SIZE + self.CELL_SIZE // 2
+            self.SCREEN.blit(label, label.get_rect(center=(x_center, y_center)))
+
     # --- Methods that MUST be overridden by child classes (e.g., TicTacToe) ---
 
     def draw_game_state(self):
@@ -112,26 +302,53 @@ class BaseGridGame:
 
     # --- Main Game Loop ---
 
+    def handle_event(self, e):
+        """ Processes one pygame event; returns False when the game should be left """
+        if e.type == pygame.QUIT:
+            # Only the window's close button gets here (see SDL_NO_SIGNAL_HANDLERS above)
+            if self.SNAPSHOT_PATH is not None:
+                snapshot.remove(self.SNAPSHOT_PATH) # Left on purpose: nothing to resume
+            return False # Only quits this game, returns to the launcher
+        
+        if e.type == pygame.KEYDOWN and e.key in (pygame.K_u, pygame.K_BACKSPACE):
+            self.takeback() # 'U' or Backspace takes the last move back
+            self.save_snapshot()
+
+        if e.type == pygame.KEYDOWN and e.key == pygame.K_a:
+            self.toggle_analysis() # 'A' shows / hides the move scores
+
+        if e.type == pygame.MOUSEBUTTONDOWN:
+            x, y = e.pos # Position of the click itself (also works for scripted events)
+            row, col = self._pixel_to_coord(x, y)
+            
+            if row is not None:
+                algebraic_coord = self._coord_to_algebraic(row, col)
+                # Calls the specific logic of the child game
+                self.handle_player_move(algebraic_coord, row, col)
+                self.save_snapshot()
+        return True
+
+    def render_frame(self):
+        """ Draws one complete frame into SCREEN (without flipping the display) """
+        self.draw_grid_and_headers()
+        self.draw_game_state() # Calls the specific drawing method of the child game
+        self.draw_analysis_overlay()
+
     def run_game(self):
         running = True
         while running:
             # Event handling
             for e in pygame.event.get():
-                if e.type == pygame.QUIT:
-                    running = False # Only quits this game, returns to the launcher
-                
-                if e.type == pygame.MOUSEBUTTONDOWN:
-                    x, y = pygame.mouse.get_pos()
-                    row, col = self._pixel_to_coord(x, y)
-                    
-                    if row is not None:
-                        algebraic_coord = self._coord_to_algebraic(row, col)
-                        # Calls the specific logic of the child game
-                        self.handle_player_move(algebraic_coord, row, col)
+                if not self.handle_event(e):
+                    running = False
+
+            self.update_analysis()
 
             # Drawing
-            self.draw_grid_and_headers()
-            self.draw_game_state() # Calls the specific drawing method of the child game
+            self.render_frame()
             
             pygame.display.flip()
-            self.clock.tick(60)
\ No newline at end of file
+            self.clock.tick(60)
+
+        if self.ANALYSIS is not None:
+            self.toggle_analysis() # Stops the worker thread
\ No newline at end of file
@@ -1,10 +1,14 @@
 import pygame
-import random
 from .base_game import BaseGridGame # Imports our base class
+from .analysis_cache import AnalysisCache
+from .line_index import LineCounters
+from .mcts import MCTS
+from .rules import ConnectFourState, PLAYER_1, PLAYER_2
 
 # ConnectFourGame INHERITS from BaseGridGame
 class ConnectFourGame(BaseGridGame):
-    
+    GAME_ID = "connectfour"
+
     def __init__(self):
         # --- 1. Call the constructor of the base class ---
         # Connect Four is 6 rows high, 7 columns wide
@@ -23,6 +27,8 @@ class ConnectFourGame(BaseGridGame):
         # Player Definitions
         self.PLAYER_1 = 'P1' # Human
         self.PLAYER_2 = 'P2' # Robot
+        self.HUMAN_PLAYER = self.PLAYER_1 # Used by takeback
+        self.PIECES = {self.PLAYER_1: PLAYER_1, self.PLAYER_2: PLAYER_2} # Used by snapshots and the AI
         
         # Specific colors (matching your gray theme)
         self.PLAYER_1_COLOR = (70, 70, 70)   # Dark Gray (like X)
@@ -34,6 +40,12 @@ class ConnectFourGame(BaseGridGame):
         self.GAME_OVER = False
         self.WINNER = None
         self.STATUS_MESSAGE = "Player 1's turn"
+        self.LINES = LineCounters.for_board(self.ROWS, self.COLS, 4) # Wins / draws without rescanning the board
+
+        # --- AI: Monte Carlo Tree Search (budget = difficulty) ---
+        # The search runs inside the game loop, which stops drawing meanwhile: a bigger
+        # budget makes the robot stronger but the window less responsive (~0.25 s per move)
+        self.AI = MCTS(iterations=2000, time_limit=0.25, cache=AnalysisCache.shared())
 
     # --- 5. Specific helper functions ---
 
@@ -50,51 +62,31 @@ class ConnectFourGame(BaseGridGame):
 
     def _is_board_full(self):
         """ Checks if the entire board is full """
-        for c in range(self.COLS):
-            if self._is_valid_location(c):
-                return False
-        return True
+        return self.LINES.is_full()
 
     def check_winner(self, piece):
-        """ Checks all 4-in-a-row conditions """
-        # Check horizontal
-        for c in range(self.COLS - 3):
-            for r in range(self.ROWS):
-                if all(self.BOARD[r][c+i] == piece for i in range(4)):
-                    return True
-        # Check vertical
-        for c in range(self.COLS):
-            for r in range(self.ROWS - 3):
-                if all(self.BOARD[r+i][c] == piece for i in range(4)):
-                    return True
-        # Check positive diagonal (/)
-        for c in range(self.COLS - 3):
-            for r in range(3, self.ROWS): # Start from row 3 (index) upwards
-                if all(self.BOARD[r-i][c+i] == piece for i in range(4)):
-                    return True
-        # Check negative diagonal (\)
-        for c in range(self.COLS - 3):
-            for r in range(self.ROWS - 3):
-                if all(self.BOARD[r+i][c+i] == piece for i in range(4)):
-                    return True
-        return False
+        """ Checks for 4-in-a-row via the line counters (updated by make_move / unmake_move) """
+        return self.LINES.has_won(self.PIECES[piece])
+
+    def rules_state(self):
+        """ Headless state for the AI and the analysis overlay (scores show on the drop cells) """
+        return ConnectFourState.from_board(self.BOARD, self.PIECES, self.PIECES[self.CURRENT_PLAYER])
 
     def ai_move(self):
-        """ Simple AI: Chooses a random valid column """
+        """ MCTS AI: Chooses the column with the most successful playouts """
         if self.GAME_OVER or self.CURRENT_PLAYER != self.PLAYER_2:
             return
 
-        # Find all columns that are not full
-        valid_cols = [c for c in range(self.COLS) if self._is_valid_location(c)]
-        
-        if not valid_cols:
+        state = self.rules_state()
+        col = self.AI.search(state)
+
+        if col is None:
             return # No move possible
 
-        col = random.choice(valid_cols)
         row = self._get_next_open_row(col)
         
         # Make the move
-        self.BOARD[row][col] = self.PLAYER_2
+        self.make_move(row, col, self.PLAYER_2)
         
         algebraic = self._coord_to_algebraic(row, col)
         print(f"[ROBOT] moves to Column {chr(ord('A') + col)} (drops to {algebraic})")
@@ -111,6 +103,20 @@ class ConnectFourGame(BaseGridGame):
             self.CURRENT_PLAYER = self.PLAYER_1
             self.STATUS_MESSAGE = "Player 1's turn"
 
+    def after_restore(self):
+        """ Rebuilds the status message after a snapshot was restored """
+        if self.WINNER == self.PLAYER_1:
+            self.STATUS_MESSAGE = "Player 1 wins!"
+        elif self.WINNER == self.PLAYER_2:
+            self.STATUS_MESSAGE = "Robot wins!"
+        elif self.GAME_OVER:
+            self.STATUS_MESSAGE = "It's a draw!"
+        elif self.CURRENT_PLAYER == self.PLAYER_1:
+            self.STATUS_MESSAGE = "Player 1's turn"
+        else:
+            self.STATUS_MESSAGE = "Robot's turn..."
+            self.ai_move()
+
     # --- 4. Override Base Class Methods ---
 
     def draw_game_state(self):
@@ -148,7 +154,7 @@ class ConnectFourGame(BaseGridGame):
             drop_row = self._get_next_open_row(col)
             
             # Make the move
-            self.BOARD[drop_row][col] = self.PLAYER_1
+            self.make_move(drop_row, col, self.PLAYER_1)
             
             # Robot-friendly output
             real_algebraic = self._coord_to_algebraic(drop_row, col)
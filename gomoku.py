@@ -0,0 +1,131 @@
+import pygame
+import random
+from .base_game import BaseGridGame # Imports our base class
+from .k_in_a_row import KInARowEngine, EMPTY
+from .rules import PLAYER_1, PLAYER_2
+
+# GomokuGame INHERITS from BaseGridGame
+class GomokuGame(BaseGridGame):
+    EMPTY = EMPTY # Free cells are 0 on the NumPy board
+    GAME_ID = "gomoku"
+
+    def __init__(self, size=15):
+        # --- 1. Call the constructor of the base class ---
+        # Gomoku is played on a 15x15 board (19x19 also works), so the cells are small
+        super().__init__(rows=size, cols=size, cell_size=50, header_size=50)
+
+        # --- 2. Gomoku specific settings ---
+        pygame.display.set_caption("Gomoku (Five in a Row)")
+
+        # Player Definitions (these are also the values stored in the NumPy board)
+        self.PLAYER_1 = 1 # Human
+        self.PLAYER_2 = 2 # Robot
+        self.HUMAN_PLAYER = self.PLAYER_1 # Used by takeback
+        self.PIECES = {self.PLAYER_1: PLAYER_1, self.PLAYER_2: PLAYER_2} # Used by snapshots
+
+        # Specific colors (matching the gray theme)
+        self.PLAYER_1_COLOR = (70, 70, 70)   # Dark Gray
+        self.PLAYER_2_COLOR = (150, 150, 150) # Light Gray
+
+        # --- 3. Gomoku game logic ---
+        # The vectorized k-in-a-row engine owns the int8 board
+        self.ENGINE = KInARowEngine(self.ROWS, self.COLS, k=5)
+        self.BOARD = self.ENGINE.BOARD
+        self.CURRENT_PLAYER = self.PLAYER_1
+        self.GAME_OVER = False
+        self.WINNER = None
+        self.STATUS_MESSAGE = "Player 1's turn"
+
+    # --- 5. Specific helper functions ---
+
+    def _finish_move(self, player, row, col):
+        """ Places a stone and updates winner / draw / current player """
+        self.make_move(row, col, player) # Writes into ENGINE.BOARD (same array)
+
+        if self.ENGINE.check_winner(player):
+            self.GAME_OVER = True
+            self.WINNER = player
+            self.STATUS_MESSAGE = "Player 1 wins!" if player == self.PLAYER_1 else "Robot wins!"
+        elif self.ENGINE.is_full():
+            self.GAME_OVER = True
+            self.STATUS_MESSAGE = "It's a draw!"
+        else:
+            self.CURRENT_PLAYER = self.PLAYER_2 if player == self.PLAYER_1 else self.PLAYER_1
+            self.STATUS_MESSAGE = "Player 1's turn" if self.CURRENT_PLAYER == self.PLAYER_1 else "Robot's turn..."
+
+    def _candidate_moves(self):
+        """ Free cells next to an existing stone (or the center on an empty board) """
+        occupied = self.BOARD != EMPTY
+        if not occupied.any():
+            return [(self.ROWS // 2, self.COLS // 2)]
+
+        # Dilate the occupied mask by one cell in every direction
+        near = occupied.copy()
+        near[1:, :] |= occupied[:-1, :]
+        near[:-1, :] |= occupied[1:, :]
+        near[:, 1:] |= near[:, :-1].copy()
+        near[:, :-1] |= near[:, 1:].copy()
+        return [(r, c) for r, c in self.ENGINE.empty_cells() if near[r, c]]
+
+    def ai_move(self):
+        """ Simple AI: win if possible, otherwise block, otherwise play next to a stone """
+        if self.GAME_OVER or self.CURRENT_PLAYER != self.PLAYER_2:
+            return
+
+        # Both checks test every free cell at once in a single batch call
+        moves = self.ENGINE.winning_moves(self.PLAYER_2)
+        if not moves:
+            moves = self.ENGINE.winning_moves(self.PLAYER_1)
+        if not moves:
+            moves = self._candidate_moves()
+        if not moves:
+            return # No move possible
+
+        row, col = random.choice(moves)
+
+        algebraic = self._coord_to_algebraic(row, col)
+        print(f"[ROBOT] Moving to: {algebraic} (Grid: {row}, {col})")
+
+        self._finish_move(self.PLAYER_2, row, col)
+
+    def after_restore(self):
+        """ Rebuilds the status message after a snapshot was restored """
+        if self.WINNER is not None:
+            self.STATUS_MESSAGE = "Player 1 wins!" if self.WINNER == self.PLAYER_1 else "Robot wins!"
+        elif self.GAME_OVER:
+            self.STATUS_MESSAGE = "It's a draw!"
+        elif self.CURRENT_PLAYER == self.PLAYER_1:
+            self.STATUS_MESSAGE = "Player 1's turn"
+        else:
+            self.STATUS_MESSAGE = "Robot's turn..."
+            self.ai_move()
+
+    # --- 4. Override Base Class Methods ---
+
+    def draw_game_state(self):
+        """ Draws the stones (circles) """
+
+        PIECE_RADIUS = self.CELL_SIZE // 2 - 5 # Radius of the stones
+
+        for r, c in zip(*self.BOARD.nonzero()):
+            x_center = self.HEADER_SIZE + c * self.CELL_SIZE + self.CELL_SIZE // 2
+            y_center = self.HEADER_SIZE + r * self.CELL_SIZE + self.CELL_SIZE // 2
+
+            color = self.PLAYER_1_COLOR if self.BOARD[r, c] == self.PLAYER_1 else self.PLAYER_2_COLOR
+            pygame.draw.circle(self.SCREEN, color, (x_center, y_center), PIECE_RADIUS)
+
+        # Draw the status message
+        self.draw_status_message(self.STATUS_MESSAGE)
+
+    def handle_player_move(self, algebraic_coord, row, col):
+        """ Processes the player's click (P1) """
+        if self.GAME_OVER or self.CURRENT_PLAYER != self.PLAYER_1:
+            return # Game over or Robot's turn
+
+        if not self.ENGINE.is_valid_move(row, col):
+            self.STATUS_MESSAGE = "Cell is taken! Try another."
+            return
+
+        print(f"[PLAYER] Moving to: {algebraic_coord} (Grid: {row}, {col})")
+        self._finish_move(self.PLAYER_1, row, col)
+        self.ai_move() # Robot answers immediately
@@ -0,0 +1,158 @@
+import numpy as np
+
+# Cell values on the NumPy board
+EMPTY = 0
+PLAYER_1 = 1
+PLAYER_2 = 2
+
+# The four line directions as (d_row, d_col). The anti-diagonal (/) is
+# handled by mirroring the board and reusing the (1, 1) direction.
+DIRECTIONS = [(0, 1), (1, 0), (1, 1)]
+
+
+def _and_shifted(a, b, step, dr, dc):
+    """
+    Combines two run maps: result[i, j] = a[i, j] & b[i + step*dr, j + step*dc].
+    Both arrays may carry any number of leading (batch) axes. The result is
+    cropped to the region where both inputs are defined.
+    """
+    h = min(a.shape[-2], b.shape[-2] - step * dr)
+    w = min(a.shape[-1], b.shape[-1] - step * dc)
+    if h <= 0 or w <= 0:
+        return np.zeros(a.shape[:-2] + (max(h, 0), max(w, 0)), dtype=bool)
+    r0, c0 = step * dr, step * dc
+    return a[..., :h, :w] & b[..., r0:r0 + h, c0:c0 + w]
+
+
+def run_starts(mask, k, dr, dc):
+    """
+    Returns a boolean array marking every cell that starts a run of k
+    set cells in direction (dr, dc).
+
+    Runs are built by binary doubling (run of 2L = run of L & run of L
+    shifted by L), so one direction costs O(log k) whole-array operations
+    instead of O(rows * cols * k) Python comparisons.
+    """
+    result = None
+    offset = 0
+    power = mask
+    step = 1
+    remaining = k
+    while remaining:
+        if remaining & 1:
+            result = power if result is None else _and_shifted(result, power, offset, dr, dc)
+            offset += step
+        remaining >>= 1
+        if remaining:
+            power = _and_shifted(power, power, step, dr, dc)
+            step *= 2
+    return result
+
+
+class KInARowEngine:
+    """
+    Generic k-in-a-row rules (Tic Tac Toe, Connect Four, Gomoku, ...) on a
+    NumPy int8 board. Every check also accepts a stack of boards with shape
+    (N, rows, cols) and evaluates all of them in one vectorized call.
+    """
+
+    def __init__(self, rows, cols, k, gravity=False):
+        self.ROWS = rows
+        self.COLS = cols
+        self.K = k
+        self.GRAVITY = gravity # True: pieces drop to the lowest free row (Connect Four)
+        self.BOARD = self.new_board()
+
+    def new_board(self, count=None):
+        """ Creates an empty board, or a stack of `count` empty boards """
+        shape = (self.ROWS, self.COLS) if count is None else (count, self.ROWS, self.COLS)
+        return np.zeros(shape, dtype=np.int8)
+
+    # --- Moves ---
+
+    def is_valid_move(self, row, col):
+        if not (0 <= row < self.ROWS and 0 <= col < self.COLS):
+            return False
+        if self.GRAVITY:
+            return self.BOARD[0, col] == EMPTY and row == self.next_open_row(col)
+        return self.BOARD[row, col] == EMPTY
+
+    def next_open_row(self, col):
+        """ Lowest free row in a column, or -1 if the column is full """
+        empty_rows = np.flatnonzero(self.BOARD[:, col] == EMPTY)
+        return int(empty_rows[-1]) if empty_rows.size else -1
+
+    def place(self, row, col, player):
+        self.BOARD[row, col] = player
+
+    def empty_cells(self, board=None):
+        """ All (row, col) pairs that are still free """
+        board = self.BOARD if board is None else board
+        return [(int(r), int(c)) for r, c in np.argwhere(board == EMPTY)]
+
+    # --- Vectorized checks (single board or batch) ---
+
+    def winning_runs(self, boards, player):
+        """
+        Returns one boolean "run start" map per direction for `player`.
+        Index order: horizontal, vertical, diagonal (\\), anti-diagonal (/).
+        The anti-diagonal map is expressed in mirrored column coordinates.
+        """
+        mask = np.asarray(boards) == player
+        mirrored = mask[..., ::-1]
+        runs = [run_starts(mask, self.K, dr, dc) for dr, dc in DIRECTIONS]
+        runs.append(run_starts(mirrored, self.K, 1, 1))
+        return runs
+
+    def batch_check_winner(self, boards, player):
+        """ Boolean per board: does `player` have k in a row? """
+        boards = np.asarray(boards)
+        result = np.zeros(boards.shape[:-2], dtype=bool)
+        for run in self.winning_runs(boards, player):
+            if run.size:
+                result |= run.any(axis=(-2, -1))
+        return result
+
+    def check_winner(self, player, board=None):
+        """ True if `player` has k in a row on `board` (defaults to self.BOARD) """
+        board = self.BOARD if board is None else board
+        return bool(self.batch_check_winner(board, player))
+
+    def batch_winner(self, boards):
+        """ Per board: PLAYER_1, PLAYER_2, or EMPTY if nobody has won """
+        boards = np.asarray(boards)
+        winners = np.full(boards.shape[:-2], EMPTY, dtype=np.int8)
+        winners[self.batch_check_winner(boards, PLAYER_2)] = PLAYER_2
+        winners[self.batch_check_winner(boards, PLAYER_1)] = PLAYER_1
+        return winners
+
+    def batch_is_full(self, boards):
+        return (np.asarray(boards) != EMPTY).all(axis=(-2, -1))
+
+    def is_full(self, board=None):
+        board = self.BOARD if board is None else board
+        return bool(self.batch_is_full(board))
+
+    def winning_moves(self, player, board=None):
+        """
+        All free cells where `player` would complete k in a row. Every
+        candidate move is written into its own copy of the board and the
+        whole stack is checked in a single batch call.
+        """
+        board = self.BOARD if board is None else board
+        if self.GRAVITY:
+            candidates = []
+            for col in range(self.COLS):
+                empty_rows = np.flatnonzero(board[:, col] == EMPTY)
+                if empty_rows.size:
+                    candidates.append((int(empty_rows[-1]), col))
+        else:
+            candidates = self.empty_cells(board)
+        if not candidates:
+            return []
+
+        rows, cols = np.array(candidates).T
+        stack = np.repeat(board[np.newaxis], len(candidates), axis=0)
+        stack[np.arange(len(candidates)), rows, cols] = player
+        wins = self.batch_check_winner(stack, player)
+        return [candidates[i] for i in np.flatnonzero(wins)]
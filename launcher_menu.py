@@ -3,6 +3,11 @@ import sys
 from games.tic_tac_toe import TicTacToeGame
 from games.othello import OthelloGame 
 from games.connect_four import ConnectFourGame # <-- 1. IMPORT ADDED
+from games.gomoku import GomokuGame
+from games import snapshot
+
+# A running game is snapshotted here after every move, so it survives a restart
+SNAPSHOT_PATH = "last_game.snapshot"
 
 class GameLauncher:
     def __init__(self):
@@ -41,7 +46,7 @@ class GameLauncher:
             {"name": "Tic Tac Toe", "enabled": True, "icon": "assets/icon_tictactoe.png"},
             {"name": "Othello", "enabled": True, "icon": "assets/icon_othello.png"},
             {"name": "Connect Four", "enabled": True, "icon": "assets/icon_connectfour.png"}, # <-- ADDED
-            {"name": "Game 4", "enabled": False, "icon": None},
+            {"name": "Gomoku", "enabled": True, "icon": None},
             {"name": "Game 5", "enabled": False, "icon": None},
         ]
 
@@ -86,6 +91,14 @@ class GameLauncher:
         self.clock = pygame.time.Clock()
         self.hovered_button = None
 
+    def update_hover(self, mx, my):
+        """ Remembers which enabled button is under the mouse (highlighted by draw_ui) """
+        self.hovered_button = None
+        for i, button in enumerate(self.game_buttons):
+            if button["rect"].collidepoint(mx, my) and button["enabled"]:
+                self.hovered_button = i
+                break
+
     def draw_ui(self):
         self.SCREEN.fill(self.FH_TURQUOISE)
 
@@ -157,17 +170,41 @@ class GameLauncher:
 
         pygame.display.flip()
 
+    def play_game(self, game):
+        """ Runs a game (snapshotted after every move) and comes back to the launcher """
+        game.SNAPSHOT_PATH = SNAPSHOT_PATH
+        game.run_game()
+        # Return to launcher after game
+        self.SCREEN = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
+        pygame.display.set_caption("FH Aachen Game Portal")
+
+    def resume_saved_game(self):
+        """ Continues the game that was running when the process stopped (crash, reboot, ...) """
+        saved = snapshot.load(SNAPSHOT_PATH)
+        if saved is None:
+            return
+
+        game_classes = {cls.GAME_ID: cls for cls in (TicTacToeGame, OthelloGame, ConnectFourGame, GomokuGame)}
+        print(f"Resuming {saved.game}...")
+        game = game_classes[saved.game]()
+        try:
+            game.restore(saved)
+        except ValueError as e:
+            print(f"Could not resume game: {e}")
+            snapshot.remove(SNAPSHOT_PATH)
+            self.SCREEN = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
+            return
+        self.play_game(game)
+
     def run(self):
+        self.resume_saved_game()
+
         running = True
         while running:
             mx, my = pygame.mouse.get_pos()
             
             # Check which button is hovered
-            self.hovered_button = None
-            for i, button in enumerate(self.game_buttons):
-                if button["rect"].collidepoint(mx, my) and button["enabled"]:
-                    self.hovered_button = i
-                    break
+            self.update_hover(mx, my)
             
             self.draw_ui()
 
@@ -182,26 +219,22 @@ class GameLauncher:
                             if button["name"] == "Tic Tac Toe":
                                 print("Starting Tic Tac Toe...")
                                 game = TicTacToeGame()
-                                game.run_game()
-                                # Return to launcher after game
-                                self.SCREEN = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
-                                pygame.display.set_caption("FH Aachen Game Portal")
+                                self.play_game(game)
                             
                             elif button["name"] == "Othello":
                                 print("Starting Othello...")
                                 game = OthelloGame()
-                                game.run_game()
-                                # Return to launcher after game
-                                self.SCREEN = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
-                                pygame.display.set_caption("FH Aachen Game Portal")
+                                self.play_game(game)
 
                             # --- 3. ELIF FOR CONNECT FOUR ADDED ---
                             elif button["name"] == "Connect Four":
                                 print("Starting Connect Four...")
                                 game = ConnectFourGame()
-                                game.run_game()
-                                # Return to launcher after game
-                                self.SCREEN = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
-                                pygame.display.set_caption("FH Aachen Game Portal")
+                                self.play_game(game)
+
+                            elif button["name"] == "Gomoku":
+                                print("Starting Gomoku...")
+                                game = GomokuGame()
+                                self.play_game(game)
 
             self.clock.tick(60)
\ No newline at end of file
@@ -0,0 +1,156 @@
+"""
+Incremental win / draw / threat detection for k-in-a-row boards.
+
+LineIndex precomputes every k-long line of a rows x cols board and, for
+each cell, the lines passing through it. LineCounters keeps per-player
+stone counts for every line plus the number of empty cells, updated in
+O(lines through the cell) on place / unplace. Wins, draws and open
+threats (k-1 own stones, no opposing stone) are then read off directly
+instead of rescanning the board.
+
+Cells are flat indexes (row * cols + col), players are PLAYER_1 / PLAYER_2.
+"""
+from .rules import PLAYER_1, PLAYER_2
+
+
+class LineIndex:
+    """ All k-long lines of one board geometry and the lines through every cell """
+
+    _cache = {}
+
+    def __init__(self, rows, cols, k):
+        self.ROWS, self.COLS, self.K = rows, cols, k
+        lines = []
+        for r in range(rows):
+            for c in range(cols):
+                for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_r, end_c = r + (k - 1) * dr, c + (k - 1) * dc
+                    if 0 <= end_r < rows and 0 <= end_c < cols:
+                        lines.append(tuple((r + i * dr) * cols + c + i * dc for i in range(k)))
+        self.LINES = lines
+
+        cell_lines = [[] for _ in range(rows * cols)]
+        for line_id, cells in enumerate(lines):
+            for cell in cells:
+                cell_lines[cell].append(line_id)
+        self.CELL_LINES = [tuple(ids) for ids in cell_lines]
+
+    @classmethod
+    def for_board(cls, rows, cols, k):
+        """ Shared index per geometry (it is read-only) """
+        key = (rows, cols, k)
+        if key not in cls._cache:
+            cls._cache[key] = cls(rows, cols, k)
+        return cls._cache[key]
+
+
+class LineCounters:
+    """
+    Per-player occupancy of every line. Attributes meant to be read
+    directly (e.g. by a search evaluation):
+        counts[player][line]  stones of `player` on that line
+        completed[player]     lines fully owned by `player` (> 0 means a win)
+        threats[player]       open lines one stone short of a win
+        empty_count           free cells left
+    """
+
+    __slots__ = ("index", "counts", "completed", "threats", "empty_count")
+
+    def __init__(self, index):
+        self.index = index
+        lines = len(index.LINES)
+        self.counts = [None, [0] * lines, [0] * lines] # Indexed by PLAYER_1 / PLAYER_2
+        self.completed = [0, 0, 0]
+        self.threats = [0, 0, 0]
+        self.empty_count = index.ROWS * index.COLS
+
+    @classmethod
+    def for_board(cls, rows, cols, k):
+        return cls(LineIndex.for_board(rows, cols, k))
+
+    @classmethod
+    def from_cells(cls, rows, cols, k, cells):
+        """ Counters for a flat list of cells (0 = empty, else PLAYER_1 / PLAYER_2) """
+        counters = cls.for_board(rows, cols, k)
+        for cell, player in enumerate(cells):
+            if player:
+                counters.place(cell, player)
+        return counters
+
+    def copy(self):
+        new = object.__new__(LineCounters)
+        new.index = self.index
+        new.counts = [None, self.counts[1][:], self.counts[2][:]]
+        new.completed = self.completed[:]
+        new.threats = self.threats[:]
+        new.empty_count = self.empty_count
+        return new
+
+    # --- Updates ---
+
+    def place(self, cell, player):
+        """ Adds a stone; returns True if it completed a line for `player` """
+        k = self.index.K
+        mine = self.counts[player]
+        theirs = self.counts[PLAYER_2 if player == PLAYER_1 else PLAYER_1]
+        won = False
+        for line in self.index.CELL_LINES[cell]:
+            own, opposing = mine[line], theirs[line]
+            if opposing == 0:
+                if own == k - 2:
+                    self.threats[player] += 1
+                elif own == k - 1:
+                    self.threats[player] -= 1
+                    self.completed[player] += 1
+                    won = True
+            elif own == 0 and opposing == k - 1:
+                self.threats[PLAYER_2 if player == PLAYER_1 else PLAYER_1] -= 1 # Blocked
+            mine[line] = own + 1
+        self.empty_count -= 1
+        return won
+
+    def unplace(self, cell, player):
+        """ Exact inverse of place() """
+        k = self.index.K
+        mine = self.counts[player]
+        theirs = self.counts[PLAYER_2 if player == PLAYER_1 else PLAYER_1]
+        for line in self.index.CELL_LINES[cell]:
+            own, opposing = mine[line] - 1, theirs[line]
+            if opposing == 0:
+                if own == k - 2:
+                    self.threats[player] -= 1
+                elif own == k - 1:
+                    self.threats[player] += 1
+                    self.completed[player] -= 1
+            elif own == 0 and opposing == k - 1:
+                self.threats[PLAYER_2 if player == PLAYER_1 else PLAYER_1] += 1
+            mine[line] = own
+        self.empty_count += 1
+
+    # --- Queries ---
+
+    def has_won(self, player):
+        return self.completed[player] > 0
+
+    def is_full(self):
+        return self.empty_count == 0
+
+    def winning_cells(self, player, cells):
+        """
+        Distinct empty cells where a `player` stone would complete a line
+        (`cells` is the flat board). Two threat lines can share one cell,
+        so this can be fewer than threats[player]. O(lines).
+        """
+        k = self.index.K
+        mine = self.counts[player]
+        theirs = self.counts[PLAYER_2 if player == PLAYER_1 else PLAYER_1]
+        return {cell for line, line_cells in enumerate(self.index.LINES)
+                if mine[line] == k - 1 and theirs[line] == 0
+                for cell in line_cells if not cells[cell]}
+
+    def wins_at(self, cell, player):
+        """ True if a `player` stone on the (empty) cell would complete a line """
+        k = self.index.K
+        mine = self.counts[player]
+        theirs = self.counts[PLAYER_2 if player == PLAYER_1 else PLAYER_1]
+        return any(mine[line] == k - 1 and theirs[line] == 0 for line in self.index.CELL_LINES[cell])
@@ -0,0 +1,109 @@
+"""
+Load-test client for games.server: simulates many kiosks, each playing
+random legal moves over its own connection, and reports move latency
+percentiles plus the server's session memory and cache statistics.
+
+Run with:  python -m games.load_test --sessions 300 --port 8765
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+
+async def _request(reader, writer, request):
+    writer.write(json.dumps(request).encode() + b"\n")
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+async def simulate_kiosk(host, port, game, games_per_kiosk, latencies, rng):
+    """ One kiosk: plays `games_per_kiosk` games with random moves """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(games_per_kiosk):
+            reply = await _request(reader, writer, {"op": "new", "game": game})
+            session, state = reply["session"], reply["state"]
+            while state["winner"] is None and state["legal"]:
+                start = time.perf_counter()
+                reply = await _request(reader, writer, {"op": "move", "session": session,
+                                                        "move": rng.choice(state["legal"])})
+                latencies.append(time.perf_counter() - start)
+                if not reply["ok"]:
+                    raise RuntimeError(reply["error"])
+                state = reply["state"]
+            await _request(reader, writer, {"op": "close", "session": session})
+    finally:
+        writer.close()
+
+
+async def peak_stats(host, port, interval, results, done):
+    """ Polls the server's stats while the kiosks play, keeping the busiest sample """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while not done.is_set():
+            stats = await _request(reader, writer, {"op": "stats"})
+            if stats["sessions"] >= results.get("sessions", 0):
+                results.update(stats)
+            try:
+                await asyncio.wait_for(done.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+        results["final"] = await _request(reader, writer, {"op": "stats"})
+    finally:
+        writer.close()
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+async def run(args):
+    rng = random.Random(args.seed)
+    games = args.games.split(",")
+    latencies = []
+    peak = {}
+    done = asyncio.Event()
+
+    monitor = asyncio.create_task(peak_stats(args.host, args.port, 0.5, peak, done))
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        simulate_kiosk(args.host, args.port, games[i % len(games)], args.games_per_kiosk,
+                       latencies, random.Random(rng.random()))
+        for i in range(args.sessions)
+    ])
+    elapsed = time.perf_counter() - start
+    done.set()
+    await monitor
+
+    latencies.sort()
+    final = peak.get("final", {})
+    print(f"Kiosks: {args.sessions}   Moves: {len(latencies)}   Time: {elapsed:.1f}s   "
+          f"Throughput: {len(latencies) / elapsed:.0f} moves/s")
+    print(f"Latency  p50: {_percentile(latencies, 0.50) * 1000:.1f}ms   "
+          f"p95: {_percentile(latencies, 0.95) * 1000:.1f}ms   "
+          f"p99: {_percentile(latencies, 0.99) * 1000:.1f}ms   "
+          f"max: {latencies[-1] * 1000 if latencies else 0:.1f}ms")
+    print(f"Peak sessions: {peak.get('sessions', 0)}   "
+          f"Session memory avg: {peak.get('session_bytes_avg', 0)} B   max: {peak.get('session_bytes_max', 0)} B")
+    print(f"Cache entries: {final.get('cache_memory_entries', 0)}   "
+          f"hits: {final.get('cache_hits', 0)}   misses: {final.get('cache_misses', 0)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test client for the game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--sessions", type=int, default=200, help="Concurrent simulated kiosks")
+    parser.add_argument("--games-per-kiosk", type=int, default=1)
+    parser.add_argument("--games", default="tictactoe,connectfour,othello")
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+import math
+import random
+import time
+from array import array
+
+from .rules import DRAW
+
+
+class Node:
+    """ One search tree node. Slots and flat child arrays keep nodes small. """
+
+    __slots__ = ("move", "parent", "player", "children", "untried", "visits", "wins")
+
+    def __init__(self, move, parent, player, untried):
+        self.move = move          # Move that led here (None for the root)
+        self.parent = parent
+        self.player = player      # Player who made `move`; wins are counted for them
+        self.children = []        # Expanded child nodes
+        self.untried = array("i", untried) # Moves not expanded yet
+        self.visits = 0
+        self.wins = 0.0
+
+    def best_child(self, exploration):
+        """ UCT selection """
+        log_visits = math.log(self.visits)
+        best, best_value = None, -1.0
+        for child in self.children:
+            value = child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits)
+            if value > best_value:
+                best, best_value = child, value
+        return best
+
+
+class MCTS:
+    """
+    Domain-agnostic Monte Carlo Tree Search (UCT) over the states in rules.py.
+
+    Difficulty is set by the budget: `iterations` playouts per move and/or a
+    `time_limit` in seconds (whichever runs out first). search() runs in the
+    caller's thread, so a game loop that calls it stops drawing for the
+    whole budget; interactive games keep it to a fraction of a second.
+    With an `evaluator` (state -> win probability of the side to move) a
+    leaf is scored directly instead of by a random playout. The tree is kept
+    between calls; when the next search starts from a position one or two
+    moves below the old root (the robot's move and the human's answer), that
+    subtree is reused instead of being rebuilt.
+
+    With a `cache` (analysis_cache.AnalysisCache) positions that were already
+    searched with at least `cache_depth` root visits (default: the iteration
+    budget) are answered from the cache, and every finished search is
+    written back.
+    """
+
+    CACHE_NAMESPACE = "mcts:"
+
+    def __init__(self, iterations=1000, time_limit=None, exploration=1.4, seed=None, evaluator=None,
+                 cache=None, cache_depth=None):
+        self.ITERATIONS = iterations
+        self.TIME_LIMIT = time_limit
+        self.EXPLORATION = exploration
+        self.EVALUATOR = evaluator
+        self.CACHE = cache
+        # A cached result is only served if it is at least as deep as a search of our own
+        # would be; shallower (e.g. time-cut) entries are searched again and replaced
+        self.CACHE_DEPTH = cache_depth if cache_depth is not None else iterations
+        self.last_analysis = None # (move, win rate, root visits) of the last search
+        self.random = random.Random(seed)
+        self.root = None
+        self.root_state = None
+
+    # --- Tree reuse ---
+
+    def reset(self):
+        self.root = None
+        self.root_state = None
+
+    def advance(self, move):
+        """ Moves the root down to the child for `move` (or drops the tree) """
+        if self.root is None:
+            return
+        for child in self.root.children:
+            if child.move == move:
+                child.parent = None # Let the rest of the old tree be freed
+                self.root = child
+                self.root_state.play(move)
+                return
+        self.reset()
+
+    def _find_root(self, state):
+        """ Reuses the current tree if `state` is the root or up to two moves below it """
+        key = state.key()
+        if self.root is not None:
+            root_state = self.root_state
+            if root_state.key() == key:
+                return
+            for child in self.root.children:
+                root_state.play(child.move)
+                found = root_state.key() == key
+                grandchild_move = None
+                if not found:
+                    for grandchild in child.children:
+                        root_state.play(grandchild.move)
+                        found = root_state.key() == key
+                        root_state.undo()
+                        if found:
+                            grandchild_move = grandchild.move
+                            break
+                root_state.undo()
+                if found:
+                    self.advance(child.move)
+                    if grandchild_move is not None:
+                        self.advance(grandchild_move)
+                    return
+        self.root = Node(None, None, None, state.legal_moves())
+        self.root_state = state.copy()
+
+    # --- Search ---
+
+    def search(self, state):
+        """ Returns the best move for `state.to_move` and keeps the tree for the next call """
+        if self.CACHE is not None:
+            cached = self.CACHE.lookup(state, self.CACHE_DEPTH, self.CACHE_NAMESPACE)
+            if cached is not None and cached[0] in state.legal_moves():
+                self._find_root(state)
+                self.advance(cached[0])
+                self.last_analysis = cached
+                return cached[0]
+
+        self._find_root(state)
+        root = self.root
+        deadline = None if self.TIME_LIMIT is None else time.perf_counter() + self.TIME_LIMIT
+
+        for i in range(self.ITERATIONS):
+            if deadline is not None and i % 16 == 0 and time.perf_counter() > deadline:
+                break
+            self._iterate(root, self.root_state)
+
+        if not root.children:
+            moves = state.legal_moves()
+            return self.random.choice(moves) if moves else None
+        best = max(root.children, key=lambda child: child.visits)
+        self.last_analysis = (best.move, best.wins / best.visits, root.visits)
+        if self.CACHE is not None:
+            self.CACHE.store(state, *self.last_analysis, namespace=self.CACHE_NAMESPACE)
+        self.advance(best.move)
+        return best.move
+
+    def _iterate(self, node, state):
+        """ One playout. Moves are made on `state` and undone afterwards, no copying. """
+        rng = self.random
+        played = 0
+
+        # 1. Selection: descend through fully expanded nodes
+        while not node.untried and node.children:
+            node = node.best_child(self.EXPLORATION)
+            state.play(node.move)
+            played += 1
+
+        # 2. Expansion: add one untried move
+        if node.untried:
+            untried = node.untried
+            index = rng.randrange(len(untried))
+            move = untried[index]
+            untried[index] = untried[-1]
+            untried.pop()
+            player = state.to_move
+            state.play(move)
+            played += 1
+            child = Node(move, node, player, state.legal_moves())
+            node.children.append(child)
+            node = child
+
+        if self.EVALUATOR is not None and state.winner is None:
+            # 3a. Evaluation instead of a playout, then backpropagation
+            value = self.EVALUATOR(state)
+            leaf_player = state.to_move
+            while node is not None:
+                node.visits += 1
+                node.wins += value if node.player == leaf_player else 1.0 - value
+                node = node.parent
+        else:
+            # 3b. Playout: random moves until the game ends
+            while state.winner is None:
+                state.play(rng.choice(state.legal_moves()))
+                played += 1
+
+            # 4. Backpropagation
+            winner = state.winner
+            while node is not None:
+                node.visits += 1
+                if winner == node.player:
+                    node.wins += 1.0
+                elif winner == DRAW:
+                    node.wins += 0.5
+                node = node.parent
+
+        for _ in range(played):
+            state.undo()
+
+    def move_stats(self):
+        """ (move, visits, win rate) for each root child, e.g. for debugging """
+        if self.root is None:
+            return []
+        return [(child.move, child.visits, child.wins / child.visits) for child in self.root.children]
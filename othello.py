@@ -1,10 +1,14 @@
 import pygame
-import random
 from .base_game import BaseGridGame # Importiert unsere Basis-Klasse
+from .analysis_cache import AnalysisCache
+from .mcts import MCTS
+from .rules import OthelloState, PLAYER_1, PLAYER_2
+from .othello_patterns import PatternEvaluator, PatternIndexes
 
 # OthelloGame ERBT von BaseGridGame
 class OthelloGame(BaseGridGame):
-    
+    GAME_ID = "othello"
+
     def __init__(self):
         # --- 1. Rufe den Konstruktor der Basis-Klasse auf ---
         # Othello ist 8x8. Wir machen die Zellen kleiner.
@@ -23,6 +27,8 @@ class OthelloGame(BaseGridGame):
         # Spieler-Definitionen
         self.PLAYER_B = 'B' # Human (Black)
         self.PLAYER_W = 'W' # Robot (White)
+        self.HUMAN_PLAYER = self.PLAYER_B # Für die Zugrücknahme
+        self.PIECES = {self.PLAYER_B: PLAYER_1, self.PLAYER_W: PLAYER_2} # Für Snapshots und die KI
         
         # Spezifische Farben
         self.COLOR_B = (30, 30, 30)   # Dunkles Grau (Schwarz)
@@ -38,10 +44,17 @@ class OthelloGame(BaseGridGame):
         self.WINNER = None
         self.STATUS_MESSAGE = "Player B's turn"
         
-        # Wichtig für Othello: Liste der gültigen Züge
-        self.VALID_MOVES = []
+        # Wichtig für Othello: Menge der gültigen Züge (schneller Test pro Feld)
+        self.VALID_MOVES = set()
         self.update_valid_moves() # Finde die ersten Züge
 
+        # KI: Monte Carlo Tree Search (Budget = Spielstärke), Blätter per Pattern-Tabellen bewertet.
+        # Ohne lokal trainierte othello_weights.bin sind das die untrainierten Positions-Tabellen.
+        # Die Suche läuft in der Spielschleife, die solange nicht zeichnet: mehr Budget heißt
+        # stärkerer Roboter, aber trägeres Fenster (~0.25 s pro Zug, nach einem Passen auch mehrere Züge)
+        self.AI = MCTS(iterations=1000, time_limit=0.25, evaluator=PatternEvaluator.default().win_probability,
+                       cache=AnalysisCache.shared())
+
     def setup_start_board(self):
         """ Platziert die 4 Start-Steine in der Mitte """
         self.BOARD[3][3] = self.PLAYER_W
@@ -93,13 +106,13 @@ class OthelloGame(BaseGridGame):
         return all_flips # Gibt alle Steine zurück, die umgedreht werden
 
     def update_valid_moves(self):
-        """ Aktualisiert die self.VALID_MOVES Liste für den aktuellen Spieler """
-        self.VALID_MOVES = []
+        """ Aktualisiert die self.VALID_MOVES Menge für den aktuellen Spieler """
+        self.VALID_MOVES = set()
         for r in range(self.ROWS):
             for c in range(self.COLS):
                 if self.BOARD[r][c] is None:
                     if self._get_pieces_to_flip(r, c):
-                        self.VALID_MOVES.append((r, c))
+                        self.VALID_MOVES.add((r, c))
 
     def _end_game(self):
         """ Zählt die Steine und ermittelt den Gewinner """
@@ -159,6 +172,26 @@ class OthelloGame(BaseGridGame):
                 self.STATUS_MESSAGE = "Robot's turn..."
                 self.ai_move() # Rufe die KI auf
 
+    def takeback(self):
+        """ Zugrücknahme ('U' / Backspace), danach gültige Züge neu berechnen """
+        super().takeback()
+        self.update_valid_moves()
+
+    def after_restore(self):
+        """ Baut gültige Züge und Status-Nachricht nach dem Laden eines Snapshots neu auf """
+        self.update_valid_moves()
+        if self.GAME_OVER:
+            self._end_game()
+        elif self.CURRENT_PLAYER == self.PLAYER_B:
+            self.STATUS_MESSAGE = "Player B's turn"
+        else:
+            self.STATUS_MESSAGE = "Robot's turn..."
+            self.ai_move()
+
+    def rules_state(self):
+        """ Headless Regeln-Zustand für KI und Analyse-Overlay """
+        return OthelloState.from_board(self.BOARD, self.PIECES, self.PIECES[self.CURRENT_PLAYER])
+
     # --- 4. Überschreiben der Basis-Klassen-Methoden ---
 
     def draw_game_state(self):
@@ -166,6 +199,7 @@ class OthelloGame(BaseGridGame):
         Zeichnet den Othello-Spielstand (Steine und Hinweise).
         """
         cell_radius = self.CELL_SIZE // 2 - 8 # Radius der Steine
+        show_hints = self.CURRENT_PLAYER == self.PLAYER_B
 
         for r in range(self.ROWS):
             for c in range(self.COLS):
@@ -181,7 +215,7 @@ class OthelloGame(BaseGridGame):
                     pygame.draw.circle(self.SCREEN, self.COLOR_W, (x_center, y_center), cell_radius)
                 
                 # 2. Zeichne Hinweise für den Spieler (nur wenn er dran ist)
-                if self.CURRENT_PLAYER == self.PLAYER_B and (r, c) in self.VALID_MOVES:
+                if show_hints and (r, c) in self.VALID_MOVES:
                     pygame.draw.circle(self.SCREEN, self.COLOR_HINT, (x_center, y_center), cell_radius // 4)
         
         # 3. Zeichne die Status-Nachricht
@@ -202,12 +236,8 @@ class OthelloGame(BaseGridGame):
         # Gültiger Zug
         pieces_to_flip = self._get_pieces_to_flip(row, col)
         
-        # 1. Setze den neuen Stein
-        self.BOARD[row][col] = self.PLAYER_B
-        
-        # 2. Drehe die Gegner-Steine um
-        for (r_flip, c_flip) in pieces_to_flip:
-            self.BOARD[r_flip][c_flip] = self.PLAYER_B
+        # 1. + 2. Setze den neuen Stein und drehe die Gegner-Steine um (mit Undo-Eintrag)
+        self.make_move(row, col, self.PLAYER_B, pieces_to_flip)
 
         print(f"[PLAYER] moves to {algebraic_coord}, flips {len(pieces_to_flip)} pieces.")
 
@@ -226,31 +256,16 @@ class OthelloGame(BaseGridGame):
             print("[ROBOT] AI has no moves, but was asked to move.")
             return
 
-        # KI-Strategie: Wähle den Zug, der die meisten Steine umdreht.
-        # (Das ist eine einfache "gierige" Strategie)
-        best_move = None
-        max_flips = -1
-
-        # Gehe alle gültigen Züge durch und bewerte sie
-        for (r, c) in self.VALID_MOVES:
-            num_flips = len(self._get_pieces_to_flip(r, c))
-            if num_flips > max_flips:
-                max_flips = num_flips
-                best_move = (r, c)
-        
-        # Wähle den besten Zug (oder einen zufälligen der besten, wenn es mehrere gibt)
-        if best_move is None:
-            best_move = random.choice(self.VALID_MOVES) # Fallback
+        # KI-Strategie: Monte Carlo Tree Search über die headless Regeln
+        state = self.rules_state()
+        state.patterns = PatternIndexes.from_bitboards(state.black, state.white) # Inkrementell bei play / undo
+        best_move = state.move_to_coord(self.AI.search(state))
 
         (r, c) = best_move
         pieces_to_flip = self._get_pieces_to_flip(r, c)
         
-        # 1. Setze den KI-Stein
-        self.BOARD[r][c] = self.PLAYER_W
-        
-        # 2. Drehe die Gegner-Steine um
-        for (r_flip, c_flip) in pieces_to_flip:
-            self.BOARD[r_flip][c_flip] = self.PLAYER_W
+        # 1. + 2. Setze den KI-Stein und drehe die Gegner-Steine um (mit Undo-Eintrag)
+        self.make_move(r, c, self.PLAYER_W, pieces_to_flip)
 
         algebraic = self._coord_to_algebraic(r, c)
         print(f"[ROBOT] moves to {algebraic}, flips {len(pieces_to_flip)} pieces.")
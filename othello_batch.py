@@ -0,0 +1,153 @@
+import numpy as np
+from collections import namedtuple
+
+# Bitboard layout: square index = row * 8 + col, bit (1 << index).
+# A position is a pair of uint64 arrays (player, opponent) seen from the
+# side to move, so N positions are just two arrays of shape (N,).
+
+_U64 = np.uint64
+_NOT_A_FILE = _U64(0xFEFEFEFEFEFEFEFE) # All squares except column A
+_NOT_H_FILE = _U64(0x7F7F7F7F7F7F7F7F) # All squares except column H
+_FULL = _U64(0xFFFFFFFFFFFFFFFF)
+
+# (shift amount, shift left?, wrap mask) for the 8 directions
+_DIRECTIONS = [
+    (_U64(1), True, _NOT_A_FILE),   # East
+    (_U64(1), False, _NOT_H_FILE),  # West
+    (_U64(8), True, _FULL),         # South
+    (_U64(8), False, _FULL),        # North
+    (_U64(9), True, _NOT_A_FILE),   # South-East
+    (_U64(7), True, _NOT_H_FILE),   # South-West
+    (_U64(7), False, _NOT_A_FILE),  # North-East
+    (_U64(9), False, _NOT_H_FILE),  # North-West
+]
+
+SQUARE_BITS = np.left_shift(_U64(1), np.arange(64, dtype=np.uint64))
+PASS = -1 # Move index for "no move" in apply_moves
+
+# Bits set per byte, used for the popcount lookup
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+BatchAnalysis = namedtuple("BatchAnalysis", ["legal", "flip_counts", "mobility", "discs"])
+
+
+def _shift(x, amount, left, mask):
+    return ((x << amount) if left else (x >> amount)) & mask
+
+
+def popcount(x):
+    """ Number of set bits per uint64 element (any shape) """
+    x = np.ascontiguousarray(x, dtype=np.uint64)
+    return _POPCOUNT_TABLE[x.view(np.uint8)].reshape(x.shape + (8,)).sum(axis=-1, dtype=np.int16)
+
+
+def legal_moves(player, opponent):
+    """ Bitboard of legal moves for the side to move, per position """
+    player = np.asarray(player, dtype=np.uint64)
+    opponent = np.asarray(opponent, dtype=np.uint64)
+    empty = ~(player | opponent)
+    moves = np.zeros_like(player)
+    for amount, left, mask in _DIRECTIONS:
+        # Walk over runs of opponent discs starting next to our own discs
+        run = _shift(player, amount, left, mask) & opponent
+        for _ in range(5):
+            run |= _shift(run, amount, left, mask) & opponent
+        moves |= _shift(run, amount, left, mask) & empty
+    return moves
+
+
+def flip_masks(player, opponent, moves):
+    """
+    Discs flipped by playing the single-bit bitboard `moves`, per position.
+    All arrays broadcast against each other, so (N, 1) positions with (64,)
+    moves give the flips for every square of every position at once.
+    Illegal moves simply produce 0.
+    """
+    player = np.asarray(player, dtype=np.uint64)
+    opponent = np.asarray(opponent, dtype=np.uint64)
+    moves = np.asarray(moves, dtype=np.uint64)
+    flips = np.zeros(np.broadcast_shapes(player.shape, opponent.shape, moves.shape), dtype=np.uint64)
+    for amount, left, mask in _DIRECTIONS:
+        # Walk from the move over opponent discs; keep them if we end on our own disc
+        run = _shift(moves, amount, left, mask) & opponent
+        for _ in range(5):
+            run |= _shift(run, amount, left, mask) & opponent
+        closed = (_shift(run, amount, left, mask) & player) != 0
+        flips |= np.where(closed, run, _U64(0))
+    empty = (moves & (player | opponent)) == 0
+    return np.where(empty, flips, _U64(0))
+
+
+def flip_counts(player, opponent):
+    """ (N, 64) array: discs flipped by playing each square (0 = illegal) """
+    player = np.asarray(player, dtype=np.uint64)[..., np.newaxis]
+    opponent = np.asarray(opponent, dtype=np.uint64)[..., np.newaxis]
+    return popcount(flip_masks(player, opponent, SQUARE_BITS)).astype(np.int8)
+
+
+def disc_counts(player, opponent):
+    """ (N, 2) array: disc counts of the side to move and of the opponent """
+    return np.stack([popcount(player), popcount(opponent)], axis=-1)
+
+
+def analyze(player, opponent):
+    """
+    Scores a batch of positions in one call: legal-move bitboards,
+    per-square flip counts, mobility and disc counts.
+    """
+    counts = flip_counts(player, opponent)
+    legal = np.bitwise_or.reduce(np.where(counts > 0, SQUARE_BITS, _U64(0)), axis=-1)
+    return BatchAnalysis(
+        legal=legal,
+        flip_counts=counts,
+        mobility=(counts > 0).sum(axis=-1, dtype=np.int16),
+        discs=disc_counts(player, opponent),
+    )
+
+
+def legal_move_masks(player, opponent):
+    """ (N, 64) boolean array of legal squares """
+    legal = legal_moves(player, opponent)
+    return (legal[..., np.newaxis] & SQUARE_BITS) != 0
+
+
+def apply_moves(player, opponent, squares):
+    """
+    Plays one move per position (square index 0..63, or PASS) and returns
+    the new (player, opponent) pair from the next side to move's view.
+    Moves must be legal; use legal_moves() to check first.
+    """
+    player = np.asarray(player, dtype=np.uint64)
+    opponent = np.asarray(opponent, dtype=np.uint64)
+    squares = np.asarray(squares)
+    passed = squares < 0
+    moves = np.where(passed, _U64(0), SQUARE_BITS[np.where(passed, 0, squares)])
+    flips = flip_masks(player, opponent, moves)
+    return opponent ^ flips, player | moves | flips
+
+
+def from_boards(boards, player_piece, opponent_piece):
+    """
+    Packs OthelloGame-style nested lists (BOARD[r][c] in {None, 'B', 'W'})
+    into (player, opponent) uint64 arrays.
+    """
+    cells = np.array([[[cell for cell in row] for row in board] for board in boards], dtype=object)
+    cells = cells.reshape(len(boards), 64)
+    player = np.bitwise_or.reduce(np.where(cells == player_piece, SQUARE_BITS, _U64(0)), axis=-1)
+    opponent = np.bitwise_or.reduce(np.where(cells == opponent_piece, SQUARE_BITS, _U64(0)), axis=-1)
+    return player.astype(np.uint64), opponent.astype(np.uint64)
+
+
+def to_cells(player, opponent):
+    """ (N, 8, 8) int8 boards: 1 = side to move, 2 = opponent, 0 = empty """
+    player = np.asarray(player, dtype=np.uint64)[..., np.newaxis]
+    opponent = np.asarray(opponent, dtype=np.uint64)[..., np.newaxis]
+    cells = np.where((player & SQUARE_BITS) != 0, 1, 0) + np.where((opponent & SQUARE_BITS) != 0, 2, 0)
+    return cells.astype(np.int8).reshape(cells.shape[:-1] + (8, 8))
+
+
+def start_positions(count):
+    """ `count` copies of the standard start position (Black to move) """
+    black = SQUARE_BITS[3 * 8 + 4] | SQUARE_BITS[4 * 8 + 3]
+    white = SQUARE_BITS[3 * 8 + 3] | SQUARE_BITS[4 * 8 + 4]
+    return np.full(count, black, dtype=np.uint64), np.full(count, white, dtype=np.uint64)
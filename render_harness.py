@@ -0,0 +1,295 @@
+"""
+Headless render harness: drives the games and the launcher menu through
+scripted input on SDL's dummy video driver, captures frames, compares
+them against golden PNGs and reports per-frame render times.
+
+    python -m games.render_harness                      # compare against render_golden/
+    python -m games.render_harness --update             # (re)write the golden images
+    python -m games.render_harness --scenario othello --frames 600
+
+A frame without a golden image fails the run unless --update is given.
+
+A script is a list of steps:
+    ("click", row, col)   mouse click on the center of a board cell
+    ("key", key)          key press, e.g. pygame.K_u (takeback)
+    ("hover", x, y)       mouse position (launcher menu)
+    ("frames", n)         render n more frames (timing samples only)
+    ("capture", name)     render a frame and keep it as `name`
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Must be set before pygame opens a display
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ["GAMES_ANALYSIS_CACHE"] = ":memory:" # The games' shared cache must not leave files behind
+
+import numpy as np
+import pygame
+
+from .mcts import MCTS
+
+DEFAULT_GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "render_golden")
+
+
+class Frame:
+    """ One captured frame: raw RGB bytes plus its size """
+
+    __slots__ = ("name", "size", "pixels")
+
+    def __init__(self, name, surface):
+        self.name = name
+        self.size = surface.get_size()
+        self.pixels = pygame.image.tobytes(surface, "RGB")
+
+    def surface(self):
+        return pygame.image.frombytes(self.pixels, self.size, "RGB")
+
+    def save(self, path):
+        pygame.image.save(self.surface(), path)
+
+    def differing_pixels(self, other, tolerance=0):
+        """ Number of pixels whose color differs by more than `tolerance` in any channel """
+        if self.size != other.size:
+            return self.size[0] * self.size[1]
+        a = np.frombuffer(self.pixels, dtype=np.uint8).reshape(-1, 3).astype(np.int16)
+        b = np.frombuffer(other.pixels, dtype=np.uint8).reshape(-1, 3).astype(np.int16)
+        return int(np.count_nonzero(np.abs(a - b).max(axis=1) > tolerance))
+
+    @classmethod
+    def load(cls, name, path):
+        return cls(name, pygame.image.load(path))
+
+
+class RenderReport:
+    """ Captured frames and render-time samples (seconds) of one scenario run """
+
+    def __init__(self, name):
+        self.name = name
+        self.frames = []
+        self.times = []
+
+    def timing(self):
+        """ Frame-time distribution in milliseconds """
+        if not self.times:
+            return {"frames": 0}
+        times = sorted(self.times)
+
+        def percentile(fraction):
+            return times[min(len(times) - 1, int(fraction * len(times)))] * 1000
+
+        return {
+            "frames": len(times),
+            "mean": sum(times) / len(times) * 1000,
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+            "max": times[-1] * 1000,
+        }
+
+
+class GameTarget:
+    """ Adapts a BaseGridGame to the harness: events go to handle_event, frames to render_frame """
+
+    def __init__(self, game):
+        self.game = game
+        self.SCREEN = game.SCREEN
+
+    def click(self, row, col):
+        game = self.game
+        pos = (game.HEADER_SIZE + col * game.CELL_SIZE + game.CELL_SIZE // 2,
+               game.HEADER_SIZE + row * game.CELL_SIZE + game.CELL_SIZE // 2)
+        game.handle_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+
+    def key(self, key):
+        self.game.handle_event(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode=""))
+
+    def hover(self, x, y):
+        pass # The board has no hover state
+
+    def render(self):
+        # Same work per frame as run_game (and the launcher's draw_ui): draw, then flip
+        self.game.render_frame()
+        pygame.display.flip()
+
+
+class LauncherTarget:
+    """ Adapts GameLauncher: only hover + draw_ui (a click would start a blocking game loop) """
+
+    def __init__(self, launcher):
+        self.launcher = launcher
+        self.SCREEN = launcher.SCREEN
+
+    def click(self, row, col):
+        raise ValueError("The launcher menu only supports 'hover' steps")
+
+    def key(self, key):
+        raise ValueError("The launcher menu only supports 'hover' steps")
+
+    def hover(self, x, y):
+        self.launcher.update_hover(x, y)
+
+    def render(self):
+        self.launcher.draw_ui()
+
+
+def make_deterministic(game):
+    """ Fixed-seed robot without time limit or shared cache, so scripted games always look the same """
+    random.seed(0) # Gomoku's robot picks among equal moves with random.choice
+    if isinstance(getattr(game, "AI", None), MCTS):
+        game.AI = MCTS(iterations=300, seed=0)
+    game.SNAPSHOT_PATH = None
+    return game
+
+
+def run_script(target, script, name="scenario"):
+    """ Plays `script` on a GameTarget / LauncherTarget and returns a RenderReport """
+    report = RenderReport(name)
+
+    def render():
+        start = time.perf_counter()
+        target.render()
+        report.times.append(time.perf_counter() - start)
+
+    for step in script:
+        kind = step[0]
+        if kind == "click":
+            target.click(step[1], step[2])
+        elif kind == "key":
+            target.key(step[1])
+        elif kind == "hover":
+            target.hover(step[1], step[2])
+        elif kind == "frames":
+            for _ in range(step[1]):
+                render()
+        elif kind == "capture":
+            render()
+            report.frames.append(Frame(step[1], target.SCREEN))
+        else:
+            raise ValueError(f"Unknown script step: {step!r}")
+    return report
+
+
+def compare_to_golden(report, golden_dir, tolerance=0, update=False):
+    """
+    Compares every captured frame with `golden_dir/<scenario>_<name>.png`,
+    or writes the goldens with update=True. Returns a list of
+    (frame name, result): the number of differing pixels, "missing" if
+    there is no golden, or "written".
+    """
+    results = []
+    for frame in report.frames:
+        path = os.path.join(golden_dir, f"{report.name}_{frame.name}.png")
+        if update:
+            os.makedirs(golden_dir, exist_ok=True)
+            frame.save(path)
+            results.append((frame.name, "written"))
+        elif not os.path.exists(path):
+            results.append((frame.name, "missing"))
+        else:
+            results.append((frame.name, frame.differing_pixels(Frame.load(frame.name, path), tolerance)))
+    return results
+
+
+# --- Built-in scenarios ---
+
+def _tictactoe():
+    from .tic_tac_toe import TicTacToeGame
+    return GameTarget(make_deterministic(TicTacToeGame())), [
+        ("capture", "start"), ("click", 1, 1), ("capture", "move1"),
+        ("click", 0, 0), ("click", 2, 2), ("capture", "move3"),
+        ("key", pygame.K_u), ("capture", "takeback"),
+    ]
+
+
+def _connectfour():
+    from .connect_four import ConnectFourGame
+    return GameTarget(make_deterministic(ConnectFourGame())), [
+        ("capture", "start"), ("click", 0, 3), ("click", 0, 3), ("capture", "move2"),
+        ("click", 0, 2), ("capture", "move3"),
+    ]
+
+
+def _othello():
+    from .othello import OthelloGame
+    return GameTarget(make_deterministic(OthelloGame())), [
+        ("capture", "start"), ("click", 2, 3), ("capture", "move1"),
+        ("key", pygame.K_u), ("capture", "takeback"),
+    ]
+
+
+def _gomoku():
+    from .gomoku import GomokuGame
+    return GameTarget(make_deterministic(GomokuGame())), [
+        ("capture", "start"), ("click", 7, 7), ("click", 7, 8), ("capture", "move2"),
+    ]
+
+
+def _launcher():
+    from .launcher_menu import GameLauncher
+    # GameLauncher loads assets/ relative to the working directory; build it in an
+    # empty one so the goldens always show the fallback menu, wherever we run from
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as empty_root, contextlib.redirect_stdout(io.StringIO()):
+        os.chdir(empty_root)
+        try:
+            launcher = GameLauncher()
+        finally:
+            os.chdir(cwd)
+    first = launcher.game_buttons[0]["rect"]
+    return LauncherTarget(launcher), [
+        ("hover", 0, 0), ("capture", "idle"),
+        ("hover", first.centerx, first.centery), ("capture", "hover"),
+    ]
+
+
+SCENARIOS = {
+    "tictactoe": _tictactoe,
+    "connectfour": _connectfour,
+    "othello": _othello,
+    "gomoku": _gomoku,
+    "launcher": _launcher,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless render harness with golden-image comparison")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable, default: all)")
+    parser.add_argument("--golden-dir", default=DEFAULT_GOLDEN_DIR)
+    parser.add_argument("--update", action="store_true", help="Rewrite the golden images")
+    parser.add_argument("--tolerance", type=int, default=0, help="Allowed per-channel color difference")
+    parser.add_argument("--frames", type=int, default=300, help="Extra frames rendered for timing")
+    args = parser.parse_args()
+
+    failed = False
+    for name in args.scenario or list(SCENARIOS):
+        target, script = SCENARIOS[name]()
+        report = run_script(target, script + [("frames", args.frames)], name)
+
+        timing = report.timing()
+        print(f"{name:12s} frames: {timing['frames']:5d}   mean: {timing['mean']:.2f}ms   "
+              f"p50: {timing['p50']:.2f}ms   p95: {timing['p95']:.2f}ms   "
+              f"p99: {timing['p99']:.2f}ms   max: {timing['max']:.2f}ms")
+        for frame_name, result in compare_to_golden(report, args.golden_dir, args.tolerance, args.update):
+            if result == "written":
+                print(f"    {frame_name}: golden written")
+            elif result == "missing":
+                print(f"    {frame_name}: MISSING golden (run with --update to create it)")
+                failed = True
+            elif result:
+                print(f"    {frame_name}: MISMATCH ({result} pixels differ)")
+                failed = True
+            else:
+                print(f"    {frame_name}: ok")
+    pygame.quit()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
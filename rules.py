@@ -0,0 +1,333 @@
+"""
+Headless game rules for search (no pygame).
+
+Every state exposes the same small interface so one search engine can
+drive all games:
+    to_move        -> player to move (PLAYER_1 or PLAYER_2)
+    winner         -> None while running, PLAYER_1 / PLAYER_2, or DRAW
+    legal_moves()  -> list of int moves
+    play(move)     -> applies a move in place
+    undo()         -> takes back the last play() from a compact delta stack
+    copy()         -> independent copy
+    key()          -> hashable position key (board + side to move)
+Moves are plain ints: a cell index (row * COLS + col), or a column for
+Connect Four.
+"""
+
+PLAYER_1 = 1 # Human / first player (X, P1, Black)
+PLAYER_2 = 2 # Robot / second player (O, P2, White)
+DRAW = 0
+
+
+def other(player):
+    return PLAYER_2 if player == PLAYER_1 else PLAYER_1
+
+
+class KInARowState:
+    """ Tic Tac Toe / Connect Four / Gomoku rules on a flat list of cells """
+
+    __slots__ = ("ROWS", "COLS", "K", "GRAVITY", "cells", "heights", "to_move", "winner", "empty_count",
+                 "history", "lines")
+
+    def __init__(self, rows, cols, k, gravity=False):
+        self.ROWS = rows
+        self.COLS = cols
+        self.K = k
+        self.GRAVITY = gravity
+        self.cells = [0] * (rows * cols) # 0 = empty, else PLAYER_1 / PLAYER_2
+        self.heights = [0] * cols        # Pieces per column (only used with gravity)
+        self.to_move = PLAYER_1
+        self.winner = None
+        self.empty_count = rows * cols
+        self.history = [] # Cell index of every move, for undo()
+        self.lines = None # Optional line_index.LineCounters, kept up to date by play / undo
+
+    def copy(self):
+        new = object.__new__(type(self))
+        new.ROWS, new.COLS, new.K, new.GRAVITY = self.ROWS, self.COLS, self.K, self.GRAVITY
+        new.cells = self.cells[:]
+        new.heights = self.heights[:]
+        new.to_move = self.to_move
+        new.winner = self.winner
+        new.empty_count = self.empty_count
+        new.history = self.history[:]
+        new.lines = self.lines.copy() if self.lines is not None else None
+        return new
+
+    def key(self):
+        return bytes(self.cells) + bytes((self.to_move,))
+
+    def is_terminal(self):
+        return self.winner is not None
+
+    # --- Moves ---
+
+    def legal_moves(self):
+        if self.winner is not None:
+            return []
+        if self.GRAVITY:
+            return [c for c in range(self.COLS) if self.heights[c] < self.ROWS]
+        return [i for i, cell in enumerate(self.cells) if cell == 0]
+
+    def move_to_coord(self, move):
+        """ Converts a move to the (row, col) cell it fills """
+        if self.GRAVITY:
+            return self.ROWS - 1 - self.heights[move], move
+        return divmod(move, self.COLS)
+
+    def coord_to_move(self, row, col):
+        return col if self.GRAVITY else row * self.COLS + col
+
+    def play(self, move):
+        row, col = self.move_to_coord(move)
+        player = self.to_move
+        self.cells[row * self.COLS + col] = player
+        if self.GRAVITY:
+            self.heights[col] += 1
+        self.empty_count -= 1
+        self.history.append(row * self.COLS + col)
+
+        if self.lines is not None:
+            won = self.lines.place(row * self.COLS + col, player)
+        else:
+            won = self._has_line_through(row, col, player)
+        if won:
+            self.winner = player
+        elif self.empty_count == 0:
+            self.winner = DRAW
+        self.to_move = other(player)
+
+    def undo(self):
+        """ O(1): moves are only made while nobody has won, so the cell is the whole delta """
+        index = self.history.pop()
+        self.to_move = self.cells[index]
+        if self.lines is not None:
+            self.lines.unplace(index, self.to_move)
+        self.cells[index] = 0
+        if self.GRAVITY:
+            self.heights[index % self.COLS] -= 1
+        self.empty_count += 1
+        self.winner = None
+
+    def _has_line_through(self, row, col, player):
+        """ Only lines through the last placed cell can be new wins """
+        cells, rows, cols = self.cells, self.ROWS, self.COLS
+        for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            count = 1
+            for sign in (1, -1):
+                r, c = row + sign * dr, col + sign * dc
+                while 0 <= r < rows and 0 <= c < cols and cells[r * cols + c] == player:
+                    count += 1
+                    r, c = r + sign * dr, c + sign * dc
+            if count >= self.K:
+                return True
+        return False
+
+    @classmethod
+    def from_board(cls, board, pieces, to_move, **kwargs):
+        """
+        Builds a state from a game's nested BOARD list. `pieces` maps the
+        game's cell values (e.g. {'X': PLAYER_1, 'O': PLAYER_2}) to players.
+        """
+        state = cls(**kwargs)
+        for r, row in enumerate(board):
+            for c, piece in enumerate(row):
+                if piece in pieces:
+                    state.cells[r * state.COLS + c] = pieces[piece]
+                    state.heights[c] += 1
+                    state.empty_count -= 1
+        state.to_move = to_move
+        for i, player in enumerate(state.cells):
+            if player and state._has_line_through(i // state.COLS, i % state.COLS, player):
+                state.winner = player
+                break
+        else:
+            if state.empty_count == 0:
+                state.winner = DRAW
+        return state
+
+
+class TicTacToeState(KInARowState):
+    __slots__ = ()
+
+    def __init__(self):
+        super().__init__(rows=3, cols=3, k=3)
+
+
+class ConnectFourState(KInARowState):
+    __slots__ = ()
+
+    def __init__(self):
+        super().__init__(rows=6, cols=7, k=4, gravity=True)
+
+
+# --- Othello on Python-int bitboards (square = row * 8 + col) ---
+
+_FULL = (1 << 64) - 1
+_NOT_A_FILE = 0xFEFEFEFEFEFEFEFE
+_NOT_H_FILE = 0x7F7F7F7F7F7F7F7F
+# (shift, wrap mask); positive shifts go left (towards higher squares)
+_DIRECTIONS = ((1, _NOT_A_FILE), (-1, _NOT_H_FILE), (8, _FULL), (-8, _FULL),
+               (9, _NOT_A_FILE), (7, _NOT_H_FILE), (-7, _NOT_A_FILE), (-9, _NOT_H_FILE))
+
+
+def _shift(x, shift, mask):
+    return ((x << shift) & mask & _FULL) if shift > 0 else ((x >> -shift) & mask)
+
+
+def othello_legal_moves(player, opponent):
+    """ Bitboard of legal moves for `player` """
+    empty = ~(player | opponent) & _FULL
+    moves = 0
+    for shift, mask in _DIRECTIONS:
+        run = _shift(player, shift, mask) & opponent
+        for _ in range(5):
+            run |= _shift(run, shift, mask) & opponent
+        moves |= _shift(run, shift, mask) & empty
+    return moves
+
+
+def othello_flips(player, opponent, move_bit):
+    """ Bitboard of discs flipped when `player` plays `move_bit` """
+    flips = 0
+    for shift, mask in _DIRECTIONS:
+        run = 0
+        x = _shift(move_bit, shift, mask)
+        while x & opponent:
+            run |= x
+            x = _shift(x, shift, mask)
+        if x & player:
+            flips |= run
+    return flips
+
+
+def iter_bits(bitboard):
+    """ Yields the square index of every set bit """
+    while bitboard:
+        low = bitboard & -bitboard
+        yield low.bit_length() - 1
+        bitboard ^= low
+
+
+class OthelloState:
+    """ Othello rules on two 64-bit ints. Passes are applied automatically. """
+
+    __slots__ = ("black", "white", "to_move", "winner", "legal", "history", "patterns")
+
+    ROWS = 8
+    COLS = 8
+
+    def __init__(self):
+        self.black = (1 << 28) | (1 << 35)  # BOARD[3][4] and BOARD[4][3]
+        self.white = (1 << 27) | (1 << 36)  # BOARD[3][3] and BOARD[4][4]
+        self.to_move = PLAYER_1
+        self.winner = None
+        self.legal = othello_legal_moves(self.black, self.white)
+        self.history = [] # (move bit, flip mask, mover, legal mask before) per move
+        self.patterns = None # Optional othello_patterns.PatternIndexes, updated on play / undo
+
+    def copy(self):
+        new = object.__new__(OthelloState)
+        new.black, new.white = self.black, self.white
+        new.to_move, new.winner, new.legal = self.to_move, self.winner, self.legal
+        new.history = self.history[:]
+        new.patterns = None if self.patterns is None else self.patterns.copy()
+        return new
+
+    def key(self):
+        return (self.black, self.white, self.to_move)
+
+    def is_terminal(self):
+        return self.winner is not None
+
+    def _sides(self):
+        """ (mover, opponent) bitboards """
+        if self.to_move == PLAYER_1:
+            return self.black, self.white
+        return self.white, self.black
+
+    def legal_moves(self):
+        return list(iter_bits(self.legal))
+
+    def move_to_coord(self, move):
+        return divmod(move, 8)
+
+    def coord_to_move(self, row, col):
+        return row * 8 + col
+
+    def flips(self, move):
+        player, opponent = self._sides()
+        return othello_flips(player, opponent, 1 << move)
+
+    def play(self, move):
+        player, opponent = self._sides()
+        bit = 1 << move
+        flips = othello_flips(player, opponent, bit)
+        self.history.append((bit, flips, self.to_move, self.legal))
+        if self.patterns is not None:
+            self.patterns.apply(move, flips, self.to_move)
+        player |= bit | flips
+        opponent ^= flips
+        if self.to_move == PLAYER_1:
+            self.black, self.white = player, opponent
+        else:
+            self.white, self.black = player, opponent
+        self._next_turn(player, opponent)
+
+    def undo(self):
+        """ O(1): XOR the placed disc and the flip mask back out """
+        bit, flips, mover, legal = self.history.pop()
+        if self.patterns is not None:
+            self.patterns.revert(bit.bit_length() - 1, flips, mover)
+        if mover == PLAYER_1:
+            self.black ^= bit | flips
+            self.white ^= flips
+        else:
+            self.white ^= bit | flips
+            self.black ^= flips
+        self.to_move = mover
+        self.legal = legal
+        self.winner = None
+
+    def _next_turn(self, player, opponent):
+        """ Hands the turn over, skipping a player without moves """
+        self.legal = othello_legal_moves(opponent, player)
+        if self.legal:
+            self.to_move = other(self.to_move)
+            return
+        self.legal = othello_legal_moves(player, opponent)
+        if not self.legal:
+            self._finish()
+
+    def _finish(self):
+        black, white = bin(self.black).count("1"), bin(self.white).count("1")
+        self.winner = PLAYER_1 if black > white else PLAYER_2 if white > black else DRAW
+
+    def disc_counts(self):
+        return bin(self.black).count("1"), bin(self.white).count("1")
+
+    @classmethod
+    def from_board(cls, board, pieces, to_move):
+        """ Builds a state from OthelloGame.BOARD; `pieces` maps 'B'/'W' to players """
+        state = object.__new__(cls)
+        state.black = state.white = 0
+        for r, row in enumerate(board):
+            for c, piece in enumerate(row):
+                if pieces.get(piece) == PLAYER_1:
+                    state.black |= 1 << (r * 8 + c)
+                elif pieces.get(piece) == PLAYER_2:
+                    state.white |= 1 << (r * 8 + c)
+        state.to_move = to_move
+        state.winner = None
+        state.history = []
+        state.patterns = None
+        player, opponent = state._sides()
+        state.legal = othello_legal_moves(player, opponent)
+        if not state.legal:
+            # Same skip rule as after a move
+            state.legal = othello_legal_moves(opponent, player)
+            if state.legal:
+                state.to_move = other(to_move)
+            else:
+                state._finish()
+        return state
@@ -0,0 +1,285 @@
+"""
+Headless multi-session game server.
+
+One asyncio process hosts many Tic Tac Toe / Connect Four / Othello
+sessions for thin kiosk clients. All sessions share one AI worker pool and
+one analysis cache (in memory, or on disk with --cache). The protocol is newline-delimited JSON over a local
+TCP (or Unix) socket; every request gets exactly one reply line:
+
+    {"op": "new", "game": "othello"}             -> {"ok": true, "session": 1, "state": {...}}
+    {"op": "move", "session": 1, "move": 19}     -> {"ok": true, "ai_moves": [18], "state": {...}}
+    {"op": "state", "session": 1}                -> {"ok": true, "state": {...}}
+    {"op": "close", "session": 1}                -> {"ok": true}
+    {"op": "snapshot", "session": 1}             -> {"ok": true, "data": "<hex GameSnapshot>"}
+    {"op": "restore", "data": "<hex>"}           -> {"ok": true, "session": 2, "state": {...}}
+    {"op": "stats"}                              -> {"ok": true, "sessions": ..., ...}
+
+The human is always PLAYER_1, the robot PLAYER_2. Moves use the int
+encoding of rules.py (cell index, or column for Connect Four).
+
+Run with:  python -m games.server --port 8765
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import signal
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from .analysis_cache import AnalysisCache
+from .mcts import MCTS
+from .snapshot import GameSnapshot
+from .rules import TicTacToeState, ConnectFourState, OthelloState, PLAYER_1, PLAYER_2
+
+GAMES = {
+    "tictactoe": TicTacToeState,
+    "connectfour": ConnectFourState,
+    "othello": OthelloState,
+}
+
+# AI budget per game: (iterations, time limit in seconds)
+AI_BUDGET = {
+    "tictactoe": (3000, None),
+    "connectfour": (5000, 0.5),
+    "othello": (3000, 0.5),
+}
+
+
+def _ai_search(game, state):
+    """ Runs in a worker process: one fresh MCTS search, returns (move, score, depth) """
+    iterations, time_limit = AI_BUDGET[game]
+    ai = MCTS(iterations=iterations, time_limit=time_limit)
+    ai.search(state)
+    return ai.last_analysis
+
+
+def deep_size(obj, seen=None):
+    """ Approximate memory footprint of an object graph in bytes """
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (list, tuple, set)):
+        size += sum(deep_size(item, seen) for item in obj)
+    elif isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    for cls in type(obj).__mro__:
+        for slot in getattr(cls, "__slots__", ()):
+            if hasattr(obj, slot):
+                size += deep_size(getattr(obj, slot), seen)
+    return size
+
+
+class Session:
+    """ One game in progress: only the compact rules state is kept """
+
+    __slots__ = ("id", "game", "state")
+
+    def __init__(self, session_id, game, state=None):
+        self.id = session_id
+        self.game = game
+        self.state = GAMES[game]() if state is None else state
+
+    def to_json(self):
+        state = self.state
+        if isinstance(state, OthelloState):
+            board = [1 if state.black >> i & 1 else 2 if state.white >> i & 1 else 0 for i in range(64)]
+        else:
+            board = list(state.cells)
+        return {
+            "game": self.game,
+            "rows": state.ROWS,
+            "cols": state.COLS,
+            "board": board,
+            "to_move": state.to_move,
+            "winner": state.winner,
+            "legal": state.legal_moves(),
+        }
+
+
+class GameServer:
+
+    def __init__(self, workers=None, cache_path=None):
+        self.sessions = {}
+        self.next_id = itertools.count(1)
+        self.cache = AnalysisCache(cache_path)
+        self.workers = workers
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self.pending = {} # Position key -> future, so equal positions are searched once
+        self.moves_served = 0
+
+    # --- AI ---
+
+    async def _ai_move(self, session):
+        cached = self.cache.lookup(session.state, namespace=MCTS.CACHE_NAMESPACE)
+        if cached is not None:
+            return cached[0]
+
+        key = (session.game, session.state.key())
+        future = self.pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.pool, _ai_search, session.game, session.state.copy())
+            self.pending[key] = future
+            try:
+                analysis = await future
+            finally:
+                del self.pending[key]
+            self.cache.store(session.state, *analysis, namespace=MCTS.CACHE_NAMESPACE)
+            return analysis[0]
+        return (await asyncio.shield(future))[0]
+
+    # --- Requests ---
+
+    async def handle_request(self, request):
+        op = request.get("op")
+
+        if op == "new":
+            game = request.get("game")
+            if game not in GAMES:
+                return {"ok": False, "error": f"unknown game {game!r}"}
+            session = Session(next(self.next_id), game)
+            self.sessions[session.id] = session
+            return {"ok": True, "session": session.id, "state": session.to_json()}
+
+        if op == "restore":
+            # Moves a session in from another process without replaying its moves
+            saved = GameSnapshot.from_bytes(bytes.fromhex(request.get("data", "")))
+            if saved.game not in GAMES:
+                return {"ok": False, "error": f"unknown game {saved.game!r}"}
+            session = Session(next(self.next_id), saved.game, saved.to_state())
+            self.sessions[session.id] = session
+            return {"ok": True, "session": session.id, "state": session.to_json()}
+
+        if op == "stats":
+            return {"ok": True, **self.stats()}
+
+        session = self.sessions.get(request.get("session"))
+        if session is None:
+            return {"ok": False, "error": "unknown session"}
+
+        if op == "state":
+            return {"ok": True, "state": session.to_json()}
+
+        if op == "snapshot":
+            return {"ok": True, "data": GameSnapshot.from_state(session.game, session.state).to_bytes().hex()}
+
+        if op == "close":
+            del self.sessions[session.id]
+            return {"ok": True}
+
+        if op == "move":
+            state = session.state
+            move = request.get("move")
+            if state.winner is not None or state.to_move != PLAYER_1:
+                return {"ok": False, "error": "not your turn"}
+            # type() check: JSON true / false would otherwise pass as moves 1 / 0
+            if type(move) is not int or move not in state.legal_moves():
+                return {"ok": False, "error": "illegal move"}
+            state.play(move)
+
+            # The robot answers (more than once if the human has to pass in Othello)
+            ai_moves = []
+            pool = self.pool
+            try:
+                while state.winner is None and state.to_move == PLAYER_2:
+                    ai_move = await self._ai_move(session)
+                    if session.id not in self.sessions:
+                        return {"ok": False, "error": "session closed"}
+                    state.play(ai_move)
+                    ai_moves.append(ai_move)
+            except Exception as e:
+                # AI worker failed: put the session back to before the human's move so it can be retried
+                for _ in range(len(ai_moves) + 1):
+                    state.undo()
+                if isinstance(e, BrokenProcessPool) and self.pool is pool:
+                    pool.shutdown(wait=False)
+                    self.pool = ProcessPoolExecutor(max_workers=self.workers)
+                return {"ok": False, "error": f"ai failed: {type(e).__name__}: {e}"}
+            # The server never takes moves back, so the undo history is dropped
+            state.history.clear()
+            self.moves_served += 1
+            return {"ok": True, "ai_moves": ai_moves, "state": session.to_json()}
+
+        return {"ok": False, "error": f"unknown op {op!r}"}
+
+    def stats(self):
+        """ Session count, measured per-session memory and cache efficiency """
+        sizes = [deep_size(session) for session in self.sessions.values()]
+        return {
+            "sessions": len(sizes),
+            "session_bytes_avg": sum(sizes) // len(sizes) if sizes else 0,
+            "session_bytes_max": max(sizes, default=0),
+            **self.cache.stats(),
+            "moves_served": self.moves_served,
+        }
+
+    # --- Networking ---
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    reply = await self.handle_request(request)
+                except (ValueError, TypeError, AttributeError) as e:
+                    reply = {"ok": False, "error": f"bad request: {e}"}
+                except Exception as e: # Never drop a kiosk's connection without a reply
+                    reply = {"ok": False, "error": f"internal error: {type(e).__name__}: {e}"}
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765, path=None):
+        if path:
+            server = await asyncio.start_unix_server(self.handle_client, path=path)
+            print(f"[SERVER] Listening on {path}")
+        else:
+            server = await asyncio.start_server(self.handle_client, host, port)
+            print(f"[SERVER] Listening on {host}:{port}")
+        # Stop cleanly on Ctrl+C / SIGTERM so the analysis cache gets flushed
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except NotImplementedError: # Windows
+                pass
+        async with server:
+            await stop.wait()
+
+    def shutdown(self):
+        self.pool.shutdown(cancel_futures=True)
+        self.cache.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless game server for kiosk clients")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="Listen on a Unix socket path instead of TCP")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="AI worker processes")
+    parser.add_argument("--cache", help="SQLite file for a persistent analysis cache (default: memory only)")
+    args = parser.parse_args()
+
+    server = GameServer(workers=args.workers, cache_path=args.cache)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
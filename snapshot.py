@@ -0,0 +1,191 @@
+import os
+import struct
+
+from .rules import (PLAYER_1, PLAYER_2, DRAW, KInARowState, TicTacToeState, ConnectFourState,
+                    OthelloState, othello_legal_moves)
+
+# Fixed binary layout (little endian):
+#   header: magic "GS", version, game id, rows, cols, to_move, winner, flags
+#   body:   one bitfield for PLAYER_1 and one for PLAYER_2, (rows*cols + 7) // 8 bytes each
+# The size only depends on the board size (8x8: 9 + 2 * 8 = 25 bytes, 6x7: 9 + 2 * 6 = 21 bytes).
+MAGIC = b"GS"
+VERSION = 1
+_HEADER = struct.Struct("<2sBBBBBBB")
+
+GAME_IDS = {"tictactoe": 1, "connectfour": 2, "othello": 3, "gomoku": 4}
+_GAME_NAMES = {number: name for name, number in GAME_IDS.items()}
+
+# (rows, cols) of the fixed-size games; Gomoku boards are any square of at least 5x5
+GEOMETRIES = {"tictactoe": (3, 3), "connectfour": (6, 7), "othello": (8, 8)}
+
+NO_WINNER = 255 # Winner byte while the game is running (DRAW = 0)
+FLAG_GAME_OVER = 1
+
+
+class GameSnapshot:
+    """ Compact, fixed-size state of one game: two bitboards plus turn / result """
+
+    __slots__ = ("game", "rows", "cols", "to_move", "winner", "game_over", "first", "second")
+
+    def __init__(self, game, rows, cols, to_move, winner=None, game_over=False, first=0, second=0):
+        self.game = game           # Key of GAME_IDS
+        self.rows = rows
+        self.cols = cols
+        self.to_move = to_move     # PLAYER_1 / PLAYER_2
+        self.winner = winner       # None, PLAYER_1, PLAYER_2 or DRAW
+        self.game_over = game_over
+        self.first = first         # Bitboard of PLAYER_1 pieces (bit = row * cols + col)
+        self.second = second       # Bitboard of PLAYER_2 pieces
+
+    def __eq__(self, other):
+        return isinstance(other, GameSnapshot) and all(
+            getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    # --- Binary form ---
+
+    def to_bytes(self):
+        length = (self.rows * self.cols + 7) // 8
+        winner = NO_WINNER if self.winner is None else self.winner
+        flags = FLAG_GAME_OVER if self.game_over else 0
+        header = _HEADER.pack(MAGIC, VERSION, GAME_IDS[self.game], self.rows, self.cols,
+                              self.to_move, winner, flags)
+        return header + self.first.to_bytes(length, "little") + self.second.to_bytes(length, "little")
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < _HEADER.size:
+            raise ValueError("Snapshot is truncated")
+        magic, version, game_id, rows, cols, to_move, winner, flags = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION or game_id not in _GAME_NAMES:
+            raise ValueError("Not a game snapshot")
+        length = (rows * cols + 7) // 8
+        if len(data) != _HEADER.size + 2 * length:
+            raise ValueError("Snapshot has the wrong size")
+        body = data[_HEADER.size:]
+        saved = cls(_GAME_NAMES[game_id], rows, cols, to_move,
+                    None if winner == NO_WINNER else winner,
+                    bool(flags & FLAG_GAME_OVER),
+                    int.from_bytes(body[:length], "little"),
+                    int.from_bytes(body[length:], "little"))
+        saved.validate()
+        return saved
+
+    def validate(self):
+        """ Raises ValueError unless the snapshot describes a possible position of its game """
+        if self.game in GEOMETRIES:
+            if (self.rows, self.cols) != GEOMETRIES[self.game]:
+                raise ValueError(f"A {self.game} board is not {self.rows}x{self.cols}")
+        elif self.rows != self.cols or self.rows < 5:
+            raise ValueError(f"A {self.game} board is not {self.rows}x{self.cols}")
+        if self.to_move not in (PLAYER_1, PLAYER_2):
+            raise ValueError(f"Invalid player to move: {self.to_move}")
+        if self.winner not in (None, DRAW, PLAYER_1, PLAYER_2):
+            raise ValueError(f"Invalid winner: {self.winner}")
+        if self.first & self.second:
+            raise ValueError("Both players occupy the same cell")
+        if (self.first | self.second) >> (self.rows * self.cols):
+            raise ValueError("Pieces outside the board")
+        if self.game == "connectfour":
+            occupied = self.first | self.second
+            for index in range(self.cols, self.rows * self.cols):
+                # Gravity: a piece needs a piece (or the floor) below it
+                if occupied >> (index - self.cols) & 1 and not occupied >> index & 1:
+                    raise ValueError("Connect Four piece without support")
+
+    # --- Conversion ---
+
+    def cells(self):
+        """ Yields (row, col, player) for every occupied cell """
+        for bitboard, player in ((self.first, PLAYER_1), (self.second, PLAYER_2)):
+            while bitboard:
+                low = bitboard & -bitboard
+                index = low.bit_length() - 1
+                yield index // self.cols, index % self.cols, player
+                bitboard ^= low
+
+    @classmethod
+    def from_state(cls, game, state):
+        """ Snapshot of a headless rules state (see rules.py) """
+        if isinstance(state, OthelloState):
+            first, second = state.black, state.white
+        else:
+            first = second = 0
+            for index, player in enumerate(state.cells):
+                if player == PLAYER_1:
+                    first |= 1 << index
+                elif player == PLAYER_2:
+                    second |= 1 << index
+        return cls(game, state.ROWS, state.COLS, state.to_move, state.winner,
+                   state.winner is not None, first, second)
+
+    def to_state(self):
+        """ Rebuilds the headless rules state (no move history) """
+        if self.game == "othello":
+            state = OthelloState()
+            state.black, state.white = self.first, self.second
+            state.to_move, state.winner = self.to_move, self.winner
+            state.legal = 0
+            if self.winner is None:
+                state.legal = othello_legal_moves(*state._sides())
+            return state
+        if self.game == "tictactoe":
+            state = TicTacToeState()
+        elif self.game == "connectfour":
+            state = ConnectFourState()
+        else:
+            state = KInARowState(self.rows, self.cols, k=5) # Gomoku
+        for row, col, player in self.cells():
+            state.cells[row * self.cols + col] = player
+            state.heights[col] += 1
+            state.empty_count -= 1
+        state.to_move, state.winner = self.to_move, self.winner
+        return state
+
+
+# --- Files ---
+
+def save(path, snapshot):
+    """
+    Atomically replaces the snapshot file: the few bytes are written to a
+    temporary file which is then renamed over the old one, so a crash
+    leaves either the previous or the new snapshot, never a torn one.
+    """
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(snapshot.to_bytes())
+        f.flush()
+        os.fsync(f.fileno()) # The data must be on disk before the rename can point at it
+    os.replace(temp_path, path)
+    _fsync_directory(os.path.dirname(os.path.abspath(path)))
+
+
+def _fsync_directory(directory):
+    """ Makes the rename itself durable (not possible on Windows, where it is skipped) """
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def load(path):
+    """ Returns the stored GameSnapshot, or None if there is no valid one """
+    try:
+        with open(path, "rb") as f:
+            return GameSnapshot.from_bytes(f.read())
+    except (OSError, ValueError) as e:
+        if not isinstance(e, FileNotFoundError):
+            print(f"Could not load snapshot '{path}': {e}")
+        return None
+
+
+def remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
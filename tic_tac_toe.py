@@ -1,10 +1,14 @@
 import pygame
-import random
 from .base_game import BaseGridGame # Imports our new base class
+from .analysis_cache import AnalysisCache
+from .line_index import LineCounters
+from .mcts import MCTS
+from .rules import TicTacToeState, PLAYER_1, PLAYER_2
 
 # TicTacToeGame NOW INHERITS from BaseGridGame
 class TicTacToeGame(BaseGridGame):
-    
+    GAME_ID = "tictactoe"
+
     def __init__(self):
         # --- 1. Call the constructor of the base class ---
         # We define that Tic Tac Toe is 3x3 and has larger cells
@@ -30,8 +34,15 @@ class TicTacToeGame(BaseGridGame):
         # --- 3. Tic Tac Toe game logic ---
         self.BOARD = [[None]*3 for _ in range(3)] # Internal 3x3 board
         self.CURRENT_PLAYER = "X"
+        self.HUMAN_PLAYER = "X" # Used by takeback
+        self.PIECES = {"X": PLAYER_1, "O": PLAYER_2} # Used by snapshots and the AI
         self.GAME_OVER = False
         self.WINNER = None
+        self.LINES = LineCounters.for_board(3, 3, 3) # Wins / draws without rescanning the board
+
+        # --- AI: Monte Carlo Tree Search (more iterations = stronger robot) ---
+        # Results are shared through the persistent analysis cache
+        self.AI = MCTS(iterations=3000, cache=AnalysisCache.shared())
 
     def _draw_piece(self, piece, r, c):
         """ Helper function: Draws an X or O in the cell (r, c) """
@@ -63,7 +74,7 @@ class TicTacToeGame(BaseGridGame):
         if self.GAME_OVER:
             if self.WINNER:
                 message = f"{self.WINNER} wins!"
-            elif not any(None in row for row in self.BOARD):
+            elif self.LINES.is_full():
                 message = "It's a draw!"
         
         if message:
@@ -82,47 +93,52 @@ class TicTacToeGame(BaseGridGame):
             # --- ROBOT COMMUNICATION (Example) ---
             print(f"[PLAYER] Moving to: {algebraic_coord} (Grid: {row}, {col})")
             
-            self.BOARD[row][col] = "X"
+            self.make_move(row, col, "X")
             if self.check_winner("X"):
                 self.GAME_OVER = True
                 self.WINNER = "X"
-            elif not any(None in row for row in self.BOARD):
+            elif self.LINES.is_full():
                 self.GAME_OVER = True
             else:
                 self.CURRENT_PLAYER = "O"
                 self.ai_move() # AI's turn immediately
 
+    def after_restore(self):
+        """ If the snapshot was taken on the robot's turn, let it move now """
+        if not self.GAME_OVER and self.CURRENT_PLAYER == "O":
+            self.ai_move()
+
+    def rules_state(self):
+        """ Headless state for the AI and the analysis overlay """
+        return TicTacToeState.from_board(self.BOARD, self.PIECES, self.PIECES[self.CURRENT_PLAYER])
+
     # --- 5. Tic Tac Toe specific helper functions ---
 
     def ai_move(self):
         if self.GAME_OVER:
             return
 
-        empty = [(r, c) for r in range(3) for c in range(3) if self.BOARD[r][c] is None]
-        if empty:
-            r, c = random.choice(empty)
+        state = self.rules_state()
+        move = self.AI.search(state)
+        if move is not None:
+            r, c = state.move_to_coord(move)
             
             # --- ROBOT COMMUNICATION (Example) ---
             algebraic_coord = self._coord_to_algebraic(r, c) # Uses the function from the base class
             print(f"[ROBOT] Moving to: {algebraic_coord} (Grid: {r}, {c})")
 
-            self.BOARD[r][c] = "O"
+            self.make_move(r, c, "O")
             if self.check_winner("O"):
                 self.GAME_OVER = True
                 self.WINNER = "O"
-            elif not any(None in row for row in self.BOARD):
+            elif self.LINES.is_full():
                 self.GAME_OVER = True
             else:
                 self.CURRENT_PLAYER = "X"
 
     def check_winner(self, player):
-        for row in self.BOARD:
-            if all(cell == player for cell in row): return True
-        for c in range(3):
-            if all(self.BOARD[r][c] == player for r in range(3)): return True
-        if all(self.BOARD[i][i] == player for i in range(3)): return True
-        if all(self.BOARD[i][2-i] == player for i in range(3)): return True
-        return False
+        """ O(1): the line counters are updated by make_move / unmake_move """
+        return self.LINES.has_won(self.PIECES[player])
 
     # The 'run_game' method is now completely inherited from BaseGridGame!
     # We don't need to define it here anymore.
\ No newline at end of file